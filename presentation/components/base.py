@@ -1,5 +1,12 @@
+import ast
+import collections.abc
+import functools
 import inspect
+import io
 import textwrap
+import threading
+import time
+import tokenize
 
 import param
 
@@ -14,11 +21,154 @@ class ComponentBase(param.Parameterized):
     def example(self, theme="default", accent_base_color="blue"):
         raise NotImplementedError
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        """Returns the component to show in the explorer. By default the `example`
+
+        The `doc` is the document of the session the view is built for. A view built on a thread
+        gets no `pn.state.curdoc`. It can use the `doc` to update itself asynchronously.
+        """
+        return self.example(theme=theme, accent_base_color=accent_base_color)
+
     def code(self, accent_base_color="blue"):
-        text = self.imports
-        title = type(self).__name__
-        text += f"""
-accent_base_color = "{ accent_base_color }"
+        return _get_code(type(self), self.imports, accent_base_color)
+
+    def __str__(self):
+        return type(self).__name__.upper()
+
+
+MEMOIZE_SIZE = 32
+MEMOIZE_DISK_BYTES = 2**28
+
+
+def memoize(func=None, *, max_size=MEMOIZE_SIZE, disk=False):
+    """Memoizes the results of a pure function across sessions
+
+    Use it on the data producing inner functions of the examples. The results are kept in memory,
+    keyed by the function and its arguments. The least recently used results are evicted when
+    there are more than `max_size` of them. With `disk=True` the results are also pickled to a
+    SQLite file in the data cache folder, shared by all processes and kept across restarts. The
+    results stored first are evicted from the file when it holds more than `MEMOIZE_DISK_BYTES`.
+
+    The results are shared by all sessions. So they must not be mutated.
+
+    Example:
+
+    >>> @memoize
+    ... def get_data(n=100):
+    ...     return np.random.rand(n)
+    """
+    if func is None:
+        return functools.partial(memoize, max_size=max_size, disk=disk)
+
+    # Served pages run as a new module per session. So the function is identified by its file
+    name = f"{func.__code__.co_filename}:{func.__qualname__}"
+    results = _MEMOIZED.setdefault(name, collections.OrderedDict())
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with _MEMOIZE_LOCK:
+            if key in results:
+                results.move_to_end(key)
+                return results[key]
+        if disk:
+            value = _get_disk_cache().get_or_compute(
+                f"{name}{key!r}", lambda: func(*args, **kwargs)
+            )
+        else:
+            value = func(*args, **kwargs)
+        with _MEMOIZE_LOCK:
+            value = results.setdefault(key, value)
+            while len(results) > max_size:
+                results.popitem(last=False)
+        return value
+
+    return wrapper
+
+
+_MEMOIZED = {}
+_MEMOIZE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_disk_cache():
+    from shared.cache import SQLiteCache
+
+    from .datasets import DATA_PATH
+
+    DATA_PATH.mkdir(parents=True, exist_ok=True)
+    return SQLiteCache(DATA_PATH / "memoize.sqlite", max_bytes=MEMOIZE_DISK_BYTES)
+
+
+def _is_memoize(decorator) -> bool:
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    return isinstance(decorator, ast.Name) and decorator.id == "memoize"
+
+
+def _get_example_body(component) -> str:
+    """Returns the body of the `example` method of the component class as a runnable snippet
+
+    The trailing `return component` is removed. Any other trailing `return value` is turned into
+    `component = value`. The `memoize` decorators are removed.
+    """
+    source = textwrap.dedent(inspect.getsource(component.example))
+    lines = source.splitlines(keepends=True)
+    tree = ast.parse(source)
+    function = tree.body[0]
+    body = function.body
+
+    # The comments before the first statement belong to the snippet. So it starts right after the
+    # signature or the docstring.
+    first = body[0]
+    if (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Constant)
+        and isinstance(first.value.value, str)
+    ):
+        start = first.end_lineno + 1
+    else:
+        start = _get_signature_end(source, function.lineno) + 1
+    last = body[-1]
+    end = last.end_lineno
+    if isinstance(last, ast.Return):
+        if isinstance(last.value, ast.Name) and last.value.id == "component":
+            end = last.lineno - 1
+        else:
+            line = lines[last.lineno - 1]
+            offset = last.col_offset
+            line = line[:offset] + line[offset:].replace("return", "component =", 1)
+            lines[last.lineno - 1] = line
+
+    removed = set()
+    for node in ast.walk(tree):
+        for decorator in getattr(node, "decorator_list", []):
+            if _is_memoize(decorator):
+                removed.update(range(decorator.lineno, decorator.end_lineno + 1))
+
+    text = "".join(
+        line for number, line in enumerate(lines[start - 1 : end], start) if number not in removed
+    )
+    return textwrap.dedent(text).strip() + "\n"
+
+
+def _get_signature_end(source, lineno) -> int:
+    """Returns the number of the line ending the signature of the function defined at `lineno`"""
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type == tokenize.NEWLINE and token.start[0] >= lineno:
+            return token.start[0]
+    return lineno
+
+
+@functools.lru_cache(maxsize=None)
+def get_snippet(component, imports):
+    """Returns the code snippet of the component class split around the `accent_base_color` line
+
+    The snippet is extracted once per component class.
+    """
+    title = component.__name__
+    prefix = imports
+    suffix = f"""
 template = pn.template.FastListTemplate(
     site="Awesome Panel",
     title="{title}",
@@ -28,19 +178,62 @@ template = pn.template.FastListTemplate(
 )
 theme = "dark" if template.theme == pn.template.DarkTheme else "default"
 
+
 """
-        text += textwrap.dedent(
-            inspect.getsource(self.example)
-            .replace('def example(self, theme="default", accent_base_color="blue"):', "")
-            .replace("self, ", "")
-            .replace("\n        return component", "")
-            .replace(" margin=(10, 80, 10, 15)", "")  # Hack
-        )
-
-        text += """\
+    suffix += _get_example_body(component)
+    suffix += """\
 template.main.append(component)
 template.servable()"""
-        return text
+    return prefix, suffix
 
-    def __str__(self):
-        return type(self).__name__.upper()
+
+@functools.lru_cache(maxsize=1024)
+def _get_code(component, imports, accent_base_color):
+    prefix, suffix = get_snippet(component, imports)
+    return f'{prefix}\naccent_base_color = "{ accent_base_color }"{suffix}'
+
+
+class ComponentRegistry(collections.abc.Mapping):
+    """A registry of component classes by name
+
+    Each entry is a loader function importing the libraries and data of the component and
+    returning its class. The loader runs on the first lookup of the entry. Iterating the names
+    does not load anything.
+    """
+
+    def __init__(self, loaders):
+        self._loaders = dict(loaders)
+        self._components = {}
+        self._locks = {name: threading.Lock() for name in self._loaders}
+        self.import_times = {}
+
+    def __getitem__(self, name):
+        if name not in self._components:
+            with self._locks[name]:
+                if name not in self._components:
+                    start = time.perf_counter()
+                    component = self._loaders[name]()
+                    self.import_times[name] = time.perf_counter() - start
+                    get_snippet(component, component.imports)
+                    self._components[name] = component
+        return self._components[name]
+
+    def __iter__(self):
+        return iter(self._loaders)
+
+    def __len__(self):
+        return len(self._loaders)
+
+    def is_loaded(self, name) -> bool:
+        """Returns True if the component has been loaded"""
+        return name in self._components
+
+    def report(self) -> str:
+        """Returns a Markdown table of the import time of each entry"""
+        rows = ["| Component | Import time (s) |", "|-----------|-----------------|"]
+        for name in self:
+            if name in self.import_times:
+                rows.append(f"| {name} | {self.import_times[name]:.3f} |")
+            else:
+                rows.append(f"| {name} | not loaded |")
+        return "\n".join(rows)
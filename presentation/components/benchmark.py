@@ -0,0 +1,174 @@
+"""Benchmarks the components of the explorer pages
+
+For each component it records the import time of its loader. For each theme it records the
+`example()` build time, the `code()` time, the number of Bokeh models and the size of the
+serialized Bokeh document. No browser is needed.
+
+```bash
+cd presentation
+python -m components.benchmark --save-baseline  # on the main branch
+python -m components.benchmark                  # on your branch
+```
+
+The results are written to `benchmarks/results.json` and compared to `benchmarks/baseline.json`.
+The command exits with status 1 if a metric regressed beyond its tolerance or a component that
+worked in the baseline fails. It also exits with status 1 without running the benchmarks if there
+is no baseline, unless `--save-baseline` is given.
+
+The import times are measured in a single process. So libraries shared by several components are
+only counted for the first of them. Use `--only` to measure a single component.
+"""
+import argparse
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import traceback
+
+import panel as pn
+from bokeh.document import Document
+
+BENCHMARKS_PATH = pathlib.Path(__file__).parent.parent.parent / "benchmarks"
+RESULTS_PATH = BENCHMARKS_PATH / "results.json"
+BASELINE_PATH = BENCHMARKS_PATH / "baseline.json"
+THEMES = ("default", "dark")
+REPEAT = 3
+
+# A metric regressed if its value is larger than `baseline * (1 + relative) + absolute`
+TOLERANCES = {
+    "import_seconds": (0.5, 0.05),
+    "build_seconds": (0.5, 0.05),
+    "code_seconds": (0.5, 0.001),
+    "models": (0.1, 0),
+    "json_bytes": (0.1, 0),
+}
+
+
+def get_registries():
+    """Returns the component registries by module name"""
+    from . import holoviz, ipywidgets, pyviz
+
+    return {"pyviz": pyviz.ALL, "holoviz": holoviz.ALL, "ipywidgets": ipywidgets.ALL}
+
+
+def _time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def measure(registry, name, themes=THEMES, repeat=REPEAT) -> dict:
+    """Returns the metrics of the component"""
+    component_class = registry[name]
+    result = {"import_seconds": registry.import_times.get(name, 0.0), "themes": {}}
+    component = component_class()
+    for theme in themes:
+        build_seconds, example = _time(
+            lambda: component.example(theme=theme, accent_base_color="blue"), repeat
+        )
+        code_seconds, _ = _time(lambda: component.code(accent_base_color="blue"), repeat)
+        document = Document()
+        root = pn.panel(example).get_root(document)
+        document.add_root(root)
+        result["themes"][theme] = {
+            "build_seconds": build_seconds,
+            "code_seconds": code_seconds,
+            "models": len(root.references()),
+            "json_bytes": len(document.to_json_string()),
+        }
+    return result
+
+
+def run(themes=THEMES, repeat=REPEAT, only=None) -> dict:
+    """Runs the benchmarks and returns the results"""
+    results = {}
+    for module, registry in get_registries().items():
+        for name in registry:
+            if only and name not in only:
+                continue
+            print(f"Benchmarking {module}.{name}", file=sys.stderr)
+            try:
+                results[f"{module}.{name}"] = measure(registry, name, themes, repeat)
+            except Exception:  # pylint: disable=broad-except
+                results[f"{module}.{name}"] = {"error": traceback.format_exc(limit=3)}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "panel": pn.__version__,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _flatten(results: dict) -> dict:
+    metrics = {}
+    for component, result in results["results"].items():
+        if "error" in result:
+            continue
+        metrics[f"{component}/import_seconds"] = result["import_seconds"]
+        for theme, values in result["themes"].items():
+            for metric, value in values.items():
+                metrics[f"{component}/{theme}/{metric}"] = value
+    return metrics
+
+
+def compare(results: dict, baseline: dict, tolerances=None) -> list:
+    """Returns the regressions of the results compared to the baseline as a list of strings"""
+    tolerances = TOLERANCES if tolerances is None else tolerances
+    regressions = []
+    for component, result in results["results"].items():
+        if "error" in result and "error" not in baseline["results"].get(component, {"error": ""}):
+            regressions.append(f"{component} failed: {result['error'].strip().splitlines()[-1]}")
+
+    current = _flatten(results)
+    for key, base in _flatten(baseline).items():
+        if key not in current:
+            continue
+        relative, absolute = tolerances[key.rsplit("/", 1)[-1]]
+        if current[key] > base * (1 + relative) + absolute:
+            regressions.append(f"{key}: {current[key]:.4g} > {base:.4g} (baseline)")
+    return regressions
+
+
+def main(args=None) -> int:
+    """Runs the benchmarks, saves the results and compares them to the baseline"""
+    parser = argparse.ArgumentParser(description="Benchmarks the components")
+    parser.add_argument("--results", type=pathlib.Path, default=RESULTS_PATH)
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as baseline")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--only", action="append", help="Only benchmark the given component(s)")
+    args = parser.parse_args(args)
+    if not args.save_baseline and not args.baseline.exists():
+        print(
+            f"No baseline found at {args.baseline}. Use --save-baseline to create one",
+            file=sys.stderr,
+        )
+        return 1
+
+    results = run(repeat=args.repeat, only=args.only)
+    path = args.baseline if args.save_baseline else args.results
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {path}")
+    if args.save_baseline:
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Linked brushing of a scatter and a histogram over millions of rows
+
+`hv.selection.link_selections` sends every point to the browser and evaluates the selection
+expressions over the full frame on every box select. That does not scale beyond a few hundred
+thousand rows. `CrossFilter` keeps the interaction of the `cross_filter.py` page at 10 million
+rows.
+
+- The scatter is rasterized with Datashader. Only an image of the viewport is sent.
+- The histograms are computed on the server from the bin index of each row, which is precomputed.
+- The selections are applied via precomputed sort orders of the columns. A range selection is two
+binary searches. A box selection filters the rows of its narrowest range by the other ranges.
+
+The `Index` is built once per dataset and shared by the sessions. Use `make_flowers` to generate
+a large version of the iris dataset to try it out.
+"""
+import functools
+
+import holoviews as hv
+import numpy as np
+import pandas as pd
+import param
+from holoviews.operation.datashader import datashade, dynspread
+
+UNSELECTED_COLOR = "#b0b0b0"
+BINS = 30
+
+
+@functools.lru_cache(maxsize=2)
+def make_flowers(rows: int, seed=0) -> pd.DataFrame:
+    """Returns the iris dataset resampled to the number of rows with a bit of noise added"""
+    from bokeh.sampledata.iris import flowers
+
+    random = np.random.default_rng(seed)
+    sample = random.integers(0, len(flowers), rows)
+    columns = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+    data = {
+        column: (flowers[column].values[sample] + random.normal(0, 0.1, rows)).astype(np.float32)
+        for column in columns
+    }
+    species = pd.Categorical(flowers.species)
+    data["species"] = pd.Categorical.from_codes(species.codes[sample], species.categories)
+    return pd.DataFrame(data)
+
+
+class Index:
+    """The precomputed sort orders and histogram bins of the columns of a DataFrame
+
+    Building the index of 10 million rows takes seconds. So build it once and share it between
+    the sessions.
+
+    Args:
+        data (pd.DataFrame): The data.
+        columns (list): The columns to select by.
+        hist (str): The column of the histogram.
+        bins (int): The number of bins of the histogram.
+    """
+
+    def __init__(self, data: pd.DataFrame, columns, hist: str, bins=BINS):
+        self.rows = len(data)
+        self.values = {column: np.asarray(data[column]) for column in {*columns, hist}}
+        self._orders = {}
+        self._sorted = {}
+        for column, values in self.values.items():
+            order = np.argsort(values)
+            self._orders[column] = order
+            self._sorted[column] = values[order]
+
+        self.hist = hist
+        values = self.values[hist]
+        self.edges = np.linspace(values.min(), values.max(), bins + 1)
+        bin_indices = np.searchsorted(self.edges, values, side="right") - 1
+        self._bins = np.clip(bin_indices, 0, bins - 1).astype(np.min_scalar_type(bins))
+        self.counts = np.bincount(self._bins, minlength=bins)
+
+    def _get_bounds(self, column, low, high):
+        sorted_values = self._sorted[column]
+        return (
+            np.searchsorted(sorted_values, low, side="left"),
+            np.searchsorted(sorted_values, high, side="right"),
+        )
+
+    def select(self, ranges) -> np.ndarray:
+        """Returns the indices of the rows within all the (column, low, high) ranges
+
+        The rows of the narrowest range are looked up in its sort order. They are filtered by the
+        other ranges.
+        """
+        bounds = [self._get_bounds(*selection_range) for selection_range in ranges]
+        narrowest = int(np.argmin([end - start for start, end in bounds]))
+        start, end = bounds[narrowest]
+        indices = self._orders[ranges[narrowest][0]][start:end]
+        for position, (column, low, high) in enumerate(ranges):
+            if position != narrowest:
+                values = self.values[column][indices]
+                indices = indices[(values >= low) & (values <= high)]
+        return indices
+
+    def histogram(self, indices=None) -> np.ndarray:
+        """Returns the histogram counts of the rows. Of all rows if indices is None"""
+        if indices is None:
+            return self.counts
+        return np.bincount(self._bins[indices], minlength=len(self.counts))
+
+
+@functools.lru_cache(maxsize=2)
+def get_flowers_index(rows: int) -> Index:
+    """Returns the index of `make_flowers(rows)` used by the `cross_filter.py` page"""
+    return Index(make_flowers(rows), ["sepal_length", "sepal_width"], "petal_width")
+
+
+class CrossFilter(param.Parameterized):
+    """Linked brushing of a rasterized scatter and a histogram computed on the server
+
+    Args:
+        index (Index): The index of the data.
+        x (str): The column of the x-axis of the scatter.
+        y (str): The column of the y-axis of the scatter.
+    """
+
+    scatter_bounds = param.Tuple(default=None, length=4, allow_None=True)
+    hist_bounds = param.Tuple(default=None, length=2, allow_None=True)
+
+    def __init__(self, index: Index, x: str, y: str, **params):
+        super().__init__(**params)
+        self.index = index
+        self.x, self.y, self.hist = x, y, index.hist
+
+    def get_ranges(self) -> list:
+        """Returns the selected (column, low, high) ranges"""
+        ranges = []
+        if self.scatter_bounds is not None:
+            x0, y0, x1, y1 = self.scatter_bounds
+            ranges += [(self.x, x0, x1), (self.y, y0, y1)]
+        if self.hist_bounds is not None:
+            ranges.append((self.hist, *self.hist_bounds))
+        return ranges
+
+    def get_selection(self):
+        """Returns the indices of the selected rows. Or None if nothing is selected"""
+        ranges = self.get_ranges()
+        if not ranges:
+            return None
+        return self.index.select(ranges)
+
+    def clear(self, *events):
+        """Clears the selections"""
+        self.param.update(scatter_bounds=None, hist_bounds=None)
+
+    def _get_points(self, indices=None):
+        x, y = self.index.values[self.x], self.index.values[self.y]
+        if indices is not None:
+            x, y = x[indices], y[indices]
+        return hv.Points((x, y), [self.x, self.y])
+
+    @param.depends("scatter_bounds", "hist_bounds")
+    def _get_selected_points(self):
+        indices = self.get_selection()
+        if indices is None:
+            return self._get_points()
+        return self._get_points(indices)
+
+    def get_scatter(self, color="blue", **opts):
+        """Returns the rasterized scatter. The selected points are shaded in the color"""
+        points = self._get_points()
+        unselected = dynspread(datashade(points, cmap=[UNSELECTED_COLOR]))
+        selected = dynspread(datashade(hv.DynamicMap(self._get_selected_points), cmap=[color]))
+        bounds = hv.streams.BoundsXY(source=unselected)
+        bounds.add_subscriber(lambda bounds: self.param.update(scatter_bounds=bounds))
+        return (unselected * selected).opts(
+            hv.opts.RGB(tools=["box_select"], active_tools=["box_select"], **opts)
+        )
+
+    def _get_histogram(self, counts):
+        return hv.Histogram((self.index.edges, counts), kdims=[self.hist], vdims=["count"])
+
+    @param.depends("scatter_bounds", "hist_bounds")
+    def _get_selected_histogram(self):
+        return self._get_histogram(self.index.histogram(self.get_selection()))
+
+    def get_hist(self, color="blue", **opts):
+        """Returns the histogram. The counts of the selected rows are shown in the color"""
+        unselected = self._get_histogram(self.index.counts).opts(
+            color=UNSELECTED_COLOR, line_color=None
+        )
+        selected = hv.DynamicMap(self._get_selected_histogram).opts(color=color, line_color=None)
+        bounds = hv.streams.BoundsX(source=unselected)
+        bounds.add_subscriber(lambda boundsx: self.param.update(hist_bounds=boundsx))
+        return (unselected * selected).opts(
+            hv.opts.Histogram(tools=["hover", "box_select"], active_tools=["box_select"], **opts)
+        )
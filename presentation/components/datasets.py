@@ -0,0 +1,242 @@
+"""The datasets used by the components
+
+Each dataset is fetched once into a local, columnar cache and served from there. DataFrames are
+cached as Parquet files. The `air` cube is cached as `.npy` files and served memory mapped and
+read-only, so all worker processes share the same pages in memory.
+
+Fetch all datasets up front to be able to run fully offline
+
+```bash
+cd presentation
+python -m components.datasets
+```
+
+The cache folder can be configured via the `AWESOME_PANEL_DATA_PATH` environment variable.
+
+Set the `AWESOME_PANEL_LAZY_DATA` environment variable to `1` to serve the `air` cube lazily
+instead. It is cached as a Zarr store of scaled int16 values chunked along time and opened with
+Dask. Only the chunks needed by a computation are read and decoded to float32. So the memory of a
+worker stays bounded when larger cubes of the same shape are added. This requires `dask` and
+`zarr`.
+"""
+import functools
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = pathlib.Path(
+    os.environ.get(
+        "AWESOME_PANEL_DATA_PATH", pathlib.Path(__file__).parent.parent / "data" / "cache"
+    )
+)
+BUNDLED_PATH = pathlib.Path(__file__).parent.parent / "data"
+LAZY = os.environ.get("AWESOME_PANEL_LAZY_DATA", "0").lower() in ("1", "true", "yes")
+AIR_CHUNKS = {"time": 256}
+
+
+def _write(path: pathlib.Path, write):
+    """Writes the file atomically, so that concurrent workers never read a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, tmp = tempfile.mkstemp(dir=path.parent, suffix=path.suffix)
+    os.close(handle)
+    os.chmod(tmp, 0o644)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _write_dir(path: pathlib.Path, write):
+    """Writes the folder atomically. If another worker wrote it first, its folder is kept"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=path.parent, suffix=path.suffix)
+    try:
+        write(tmp)
+        os.chmod(tmp, 0o755)
+        os.rename(tmp, path)
+    except OSError:
+        if not path.exists():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _get_frame(name, fetch) -> pd.DataFrame:
+    path = DATA_PATH / f"{name}.parquet"
+    if not path.exists():
+        frame = fetch()
+        _write(path, frame.to_parquet)
+    return pd.read_parquet(path, memory_map=True)
+
+
+def _fetch_penguins():
+    import seaborn as sns
+
+    return sns.load_dataset("penguins")
+
+
+def _fetch_sprint():
+    from bokeh.sampledata.sprint import sprint
+
+    return sprint
+
+
+def _fetch_cars():
+    from vega_datasets import data
+
+    return data.cars()
+
+
+def _fetch_mtcars():
+    from plotnine.data import mtcars
+
+    return mtcars
+
+
+def _fetch_datagrid_cars():
+    # Bundled with the repo. A copy of the ipydatagrid examples/cars.json file
+    data = json.loads((BUNDLED_PATH / "cars.json").read_text())
+    return pd.DataFrame(data["data"]).drop("index", axis=1)
+
+
+def _fetch_air():
+    import xarray as xr
+
+    return xr.tutorial.open_dataset("air_temperature").load().air
+
+
+@functools.lru_cache(maxsize=None)
+def penguins() -> pd.DataFrame:
+    """The Seaborn penguins dataset"""
+    return _get_frame("penguins", _fetch_penguins)
+
+
+@functools.lru_cache(maxsize=None)
+def sprint() -> pd.DataFrame:
+    """The Bokeh sprint dataset"""
+    return _get_frame("sprint", _fetch_sprint)
+
+
+@functools.lru_cache(maxsize=None)
+def cars() -> pd.DataFrame:
+    """The Vega cars dataset"""
+    return _get_frame("cars", _fetch_cars)
+
+
+@functools.lru_cache(maxsize=None)
+def mtcars() -> pd.DataFrame:
+    """The Plotnine mtcars dataset"""
+    return _get_frame("mtcars", _fetch_mtcars)
+
+
+@functools.lru_cache(maxsize=None)
+def datagrid_cars() -> pd.DataFrame:
+    """The cars dataset of the ipydatagrid examples"""
+    return _get_frame("datagrid_cars", _fetch_datagrid_cars)
+
+
+def air():
+    """The `air` DataArray of the xarray air_temperature tutorial dataset
+
+    See `air_memory_mapped` and, if `LAZY`, `air_lazy`.
+    """
+    if LAZY:
+        return air_lazy()
+    return air_memory_mapped()
+
+
+def _to_json_attrs(attrs: dict) -> dict:
+    """Returns the attributes with the numpy values converted to plain, JSON serializable values"""
+    return {
+        key: value.tolist() if isinstance(value, (np.ndarray, np.generic)) else value
+        for key, value in attrs.items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def air_memory_mapped():
+    """The `air` DataArray with memory mapped and read-only values"""
+    import xarray as xr
+
+    values_path = DATA_PATH / "air.npy"
+    coords_path = DATA_PATH / "air_coords.npz"
+    attrs_path = DATA_PATH / "air_attrs.json"
+    if not values_path.exists():
+        data = _fetch_air()
+        attrs = json.dumps(_to_json_attrs(data.attrs))
+        _write(attrs_path, lambda path: pathlib.Path(path).write_text(attrs))
+        _write(
+            coords_path,
+            lambda path: np.savez(path, **{dim: data[dim].values for dim in data.dims}),
+        )
+        _write(values_path, lambda path: np.save(path, data.values))
+
+    coords = np.load(coords_path)
+    dims = ("time", "lat", "lon")
+    return xr.DataArray(
+        np.load(values_path, mmap_mode="r"),
+        coords={dim: coords[dim] for dim in dims},
+        dims=dims,
+        name="air",
+        attrs=json.loads(attrs_path.read_text()),
+    )
+
+
+def _get_int16_encoding(data) -> dict:
+    """Returns the encoding of the values as int16 scaled to the range of the data"""
+    low, high = float(data.min()), float(data.max())
+    fill_value = np.iinfo(np.int16).min
+    scale_factor = (high - low) / (np.iinfo(np.int16).max - fill_value - 1) or 1.0
+    return {
+        "dtype": "int16",
+        "scale_factor": np.float32(scale_factor),
+        "add_offset": np.float32((high + low) / 2),
+        "_FillValue": fill_value,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def air_lazy():
+    """The `air` DataArray backed by Dask chunks of a Zarr store of scaled int16 values
+
+    Nothing is loaded until computed. Reductions like `air.mean(["lat", "lon"]).values` stream
+    over the chunks.
+    """
+    import xarray as xr
+
+    path = DATA_PATH / "air.zarr"
+    if not path.exists():
+        data = air_memory_mapped()
+        dataset = data.chunk(AIR_CHUNKS).to_dataset()
+        encoding = {"air": _get_int16_encoding(data)}
+        _write_dir(path, lambda tmp: dataset.to_zarr(tmp, encoding=encoding))
+    # The scale factor is stored as JSON. Without the cast the values are decoded to float64
+    return xr.open_zarr(path, chunks=AIR_CHUNKS)["air"].astype(np.float32)
+
+
+ALL = {
+    "penguins": penguins,
+    "sprint": sprint,
+    "cars": cars,
+    "mtcars": mtcars,
+    "datagrid_cars": datagrid_cars,
+    "air": air,
+}
+
+
+def fetch_all():
+    """Fetches all datasets into the local cache"""
+    for name, dataset in ALL.items():
+        print(f"Fetching {name}")
+        dataset()
+
+
+if __name__ == "__main__":
+    fetch_all()
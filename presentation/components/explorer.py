@@ -1,4 +1,16 @@
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import sys
+
+import numpy as np
 import panel as pn
+from bokeh.document import without_document_lock
+from bokeh.model import Model
+from bokeh.models import ColumnDataSource
+
+from . import payload
 
 RAW_CSS = """
 .bk-root *.bk-btn {
@@ -6,31 +18,248 @@ RAW_CSS = """
     font-weight: bold;
 }
 """
+CACHE_SIZE = 8
+CACHE_BYTES = 2**28
+MAX_DEPTH = 8
+DEBOUNCE = 0.15
+
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="explorer")
+# The examples set process global state like the Altair theme, the pyplot style and the HoloViews
+# renderer theme while building. So they are built one at a time.
+_BUILD_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="explorer-build"
+)
+
+
+def estimate_size(obj, _depth=0) -> int:
+    """Returns a rough estimate of the number of bytes held by the (pane) object
+
+    Arrays, DataFrames, strings and bytes are counted. Containers and panes are walked a few
+    levels deep. So are the data sources of Bokeh figures, the JSON of Plotly figures and the
+    `data` of HoloViews elements, Altair charts and the like.
+    """
+    if _depth > MAX_DEPTH:
+        return 0
+    if isinstance(obj, (str, bytes)):
+        return len(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):
+        return int(obj.memory_usage(deep=False).sum())
+    if isinstance(obj, dict):
+        return sum(estimate_size(value, _depth + 1) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_size(value, _depth + 1) for value in obj)
+    if isinstance(obj, pn.layout.ListLike):
+        return sum(estimate_size(value, _depth + 1) for value in obj.objects)
+    if isinstance(obj, pn.pane.PaneBase):
+        return estimate_size(obj.object, _depth + 1)
+    if isinstance(obj, pn.widgets.Widget):
+        return estimate_size(getattr(obj, "value", None), _depth + 1)
+    if isinstance(obj, Model):
+        return sum(
+            estimate_size(source.data, _depth + 1)
+            for source in obj.select({"type": ColumnDataSource})
+        )
+    if hasattr(obj, "to_plotly_json"):
+        return estimate_size(obj.to_plotly_json(), _depth + 1)
+    data = getattr(obj, "data", None)
+    if data is not None and not callable(data):
+        return estimate_size(data, _depth + 1)
+    return sys.getsizeof(obj)
+
+
+def _is_model(value) -> bool:
+    if isinstance(value, (list, tuple)) and value:
+        value = value[0]
+    return isinstance(value, Model)
+
+
+def estimate_models_size(pane) -> int:
+    """Returns a rough estimate of the number of bytes of the Bokeh models of the rendered pane
+
+    Counts the property values of all the models referenced. For example the serialized scene
+    of a VTK window. Returns 0 if the pane has not been rendered.
+    """
+    size = 0
+    for model, _ in list(pane._models.values()):  # pylint: disable=protected-access
+        for reference in model.references():
+            for value in reference.properties_with_values(include_defaults=False).values():
+                # The referenced models are counted on their own
+                if not _is_model(value):
+                    size += estimate_size(value)
+    return size
+
+
+class ComponentCache:
+    """A bounded LRU cache of built component panes shown in a layout
+
+    All cached panes are kept in the layout. Only the selected one is visible. So revisiting a
+    component only toggles the visibility of its pane and creates no new models. The least
+    recently used panes are evicted when there are more than `max_size` or their estimated size
+    exceeds `max_bytes`.
+    """
+
+    def __init__(self, layout, max_size=CACHE_SIZE, max_bytes=CACHE_BYTES):
+        self.layout = layout
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._panes = collections.OrderedDict()
+        self._sizes = {}
+        self.visible_key = None
+
+    @property
+    def nbytes(self) -> int:
+        """The estimated size of the cached panes in bytes"""
+        return sum(self._sizes.values())
+
+    def __contains__(self, key):
+        return key in self._panes
+
+    def __len__(self):
+        return len(self._panes)
+
+    def put(self, key, obj):
+        """Adds the object to the cache as a hidden pane and returns the pane"""
+        if key in self._panes:
+            return self._panes[key]
+        pane = pn.panel(obj, sizing_mode="stretch_both")
+        pane.visible = False
+        self._panes[key] = pane
+        self.layout.append(pane)
+        self._sizes[key] = max(estimate_size(pane), estimate_models_size(pane))
+        self._evict(keep={key, self.visible_key})
+        return pane
+
+    def remove(self, key):
+        """Removes the pane of the key from the cache and the layout"""
+        pane = self._panes.pop(key, None)
+        if pane is None:
+            return
+        self._sizes.pop(key)
+        self.layout.remove(pane)
+        if self.visible_key == key:
+            self.visible_key = None
+
+    def show(self, key, build=None):
+        """Shows the pane of the key. If not cached it is built by `build()`"""
+        if key not in self._panes:
+            self.put(key, build())
+        self._panes.move_to_end(key)
+        self.visible_key = key
+        for cached_key, pane in self._panes.items():
+            pane.visible = cached_key == key
+        return self._panes[key]
+
+    def _evict(self, keep):
+        for key in list(self._panes):
+            if len(self._panes) <= self.max_size and self.nbytes <= self.max_bytes:
+                break
+            if key in keep:
+                continue
+            pane = self._panes.pop(key)
+            self._sizes.pop(key)
+            self.layout.remove(pane)
+
+
+def _schedule_unlocked(doc, func, *args):
+    """Schedules `func(*args)` on the next tick without holding the document lock
+
+    `without_document_lock` marks the function it returns. The mark would be lost on a
+    `functools.partial` of a decorated function.
+    """
+    return doc.add_next_tick_callback(without_document_lock(functools.partial(func, *args)))
+
 
 def get_component_explorer(config, description, components):
-    def show(component):
-        component = components[component]
-        return component.example(theme=config.theme, accent_base_color=config.accent_base_color)
+    """Returns a template for exploring the components
+
+    Args:
+        config (Configuration): The configuration of the page
+        description (str): The description of the page
+        components (Mapping): The component classes by name. For example a `ComponentRegistry`.
+            A component is only loaded when selected.
 
+    When served, the selected component is loaded on a thread and built on the build thread with
+    a loading indicator. A selection superseded by a newer one before it is built is skipped.
+    """
+    instances = {}
+    failed = set()
+    latest = {"generation": 0}
+    meter = None
+    if pn.state.curdoc is not None and pn.state.curdoc.session_context is not None:
+        payload.install()
+        meter = payload.get_meter(pn.state.curdoc, name=config.title)
 
-    def reference(component):
-        component = components[component]
-        return f"[Reference]({ component.reference }), [Docs]({ component.docs })"
+    def _get_component(name):
+        if name not in instances:
+            instances[name] = components[name]()
+        return instances[name]
 
+    def _build(component, doc=None):
+        return component.view(
+            theme=config.theme, accent_base_color=config.accent_base_color, doc=doc
+        )
 
-    def code(component):
-        component = components[component]
-        value = component.code(accent_base_color=config.accent_base_color)
+    def _update(component):
+        code.value = component.code(accent_base_color=config.accent_base_color)
+        reference.object = f"[Reference]({ component.reference }), [Docs]({ component.docs })"
 
-        return pn.widgets.Ace(
-            value=value,
-            theme=config.ace_theme,
-            language="python",
-            min_height=400,
-            sizing_mode="stretch_both",
-            disabled=True,
+    def _show_built(generation, component, key, obj, error=False):
+        cache.put(key, obj)
+        if error:
+            # The error is shown, but the component is built again when selected again
+            failed.add(key)
+        if generation == latest["generation"]:
+            if component is not None:
+                _update(component)
+            cache.show(key)
+            view.loading = False
+
+    async def _show_async(doc, generation, name, key):
+        # Only the latest selection is built. Clicks arriving during the debounce or while
+        # loading supersede it.
+        await asyncio.sleep(DEBOUNCE)
+        if generation != latest["generation"]:
+            return
+        loop = asyncio.get_running_loop()
+        component = None
+        error = False
+        try:
+            component = await loop.run_in_executor(_EXECUTOR, _get_component, name)
+            if generation != latest["generation"]:
+                return
+            obj = await loop.run_in_executor(_BUILD_EXECUTOR, _build, component, doc)
+        except Exception as exception:  # pylint: disable=broad-except
+            obj = pn.pane.Alert(f"Could not build {name}: {exception}", alert_type="danger")
+            error = True
+        doc.add_next_tick_callback(
+            functools.partial(_show_built, generation, component, key, obj, error)
         )
 
+    def show(event):
+        latest["generation"] += 1
+        # The initial selection is triggered with event.old == event.new
+        if meter is not None and meter.current["label"] != event.new:
+            meter.switch(event.new)
+        key = (event.new, config.theme, config.accent_base_color)
+        doc = pn.state.curdoc
+        if key in failed:
+            failed.discard(key)
+            cache.remove(key)
+        if key in cache:
+            view.loading = False
+            if event.new in instances:
+                _update(instances[event.new])
+            cache.show(key)
+        elif doc is None or doc.session_context is None:
+            component = _get_component(event.new)
+            _update(component)
+            cache.show(key, lambda: _build(component))
+        else:
+            view.loading = True
+            _schedule_unlocked(doc, _show_async, doc, latest["generation"], event.new, key)
+
     select = pn.widgets.RadioButtonGroup(
         options=list(components.keys()), button_type="success", margin=(10, 0, 25, 0)
     )
@@ -39,17 +268,27 @@ def get_component_explorer(config, description, components):
     except:
         pass
 
-    show = pn.bind(show, component=select)
-    reference = pn.bind(reference, component=select)
-    code = pn.bind(code, component=select)
+    view = pn.Column(name="Component", sizing_mode="stretch_both", margin=(25, 5, 0, 5))
+    cache = ComponentCache(view)
+    code = pn.widgets.Ace(
+        theme=config.ace_theme,
+        language="python",
+        min_height=400,
+        sizing_mode="stretch_both",
+        disabled=True,
+        name="Code",
+    )
+    reference = pn.pane.Markdown()
+    select.param.watch(show, "value")
+    select.param.trigger("value")
     component = pn.Column(
         select,
         pn.Tabs(
-            pn.panel(show, sizing_mode="stretch_both", name="Component", margin=(25, 5, 0, 5)),
-            pn.panel(code, name="Code", sizing_mode="stretch_both"),
+            view,
+            code,
             sizing_mode="stretch_both",
         ),
-        pn.panel(reference),
+        reference,
         sizing_mode="stretch_both",
     )
 
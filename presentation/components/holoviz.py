@@ -1,16 +1,10 @@
-import holoviews as hv
-import hvplot.pandas  # noqa
-import hvplot.xarray  # noqa
 import numpy as np
 import panel as pn
 import param
-import xarray as xr
-from bokeh.sampledata.sprint import sprint
-from holoviews import opts, streams
-from holoviews.plotting.links import DataLink
-from .base import ComponentBase
 
-air = xr.tutorial.open_dataset("air_temperature").load().air
+from .base import ComponentBase, ComponentRegistry, memoize
+
+# The libraries and data of each component are imported by its loader. See ALL below.
 
 class Datashader(ComponentBase):
     component = param.Parameter(pn.pane.HoloViews)
@@ -49,6 +43,18 @@ air = xr.tutorial.open_dataset("air_temperature").load().air
         component = pn.pane.HoloViews(plot, min_height=400, sizing_mode="stretch_both")
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        # Serves the viewport from the precomputed pyramid instead of rasterizing all points
+        density = hv.DynamicMap(
+            pyramid.get_pyramid().get_image,
+            streams=[hv.streams.RangeXY(), hv.streams.PlotSize()],
+        ).opts(cmap="YlOrBr", colorbar=True, responsive=True, tools=["hover"])
+        mean = hv.DynamicMap(
+            get_air_mean_curve, streams=[hv.streams.RangeX(), hv.streams.PlotSize()]
+        ).opts(color=accent_base_color, responsive=True)
+        plot = (density * mean).opts(responsive=True, active_tools=["box_zoom"])
+        return pn.pane.HoloViews(plot, min_height=400, sizing_mode="stretch_both")
+
 
 class HoloViews(ComponentBase):
     component = param.Parameter(pn.pane.HoloViews)
@@ -171,12 +177,115 @@ pn.extension(sizing_mode="stretch_width")
             height=400, sizing_mode="fixed"
         )
 
-ALL = {
-    "HOLOVIEWS": HoloViews,
-    "HVPLOT": HVPlot,
-    "DATASHADER": Datashader,
-    "PARAM": Param,
-    "PANEL": Panel,
+
+# Time series reduction
+#
+# An overlay series only needs as many points as the plot has pixels. So the series are reduced
+# once, cached and downsampled to the width of the viewport. They are re-resolved on zoom.
+
+LTTB_MIN_POINTS = 100
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int):
+    """Downsamples the series to `threshold` points via Largest Triangle Three Buckets (LTTB)
+
+    The first and last points are kept. `x` may be numeric or datetime64.
+    """
+    if threshold >= len(x) or threshold < 3:
+        return x, y
+    xs = x.astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x.astype(np.float64)
+    xs = xs.astype(np.float64)
+    ys = y.astype(np.float64)
+
+    edges = np.linspace(1, len(x) - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, len(x) - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        next_x = xs[end:next_end].mean()
+        next_y = ys[end:next_end].mean()
+        areas = np.abs(
+            (xs[previous] - next_x) * (ys[start:end] - ys[previous])
+            - (xs[previous] - xs[start:end]) * (next_y - ys[previous])
+        )
+        previous = start + int(areas.argmax())
+        indices[bucket + 1] = previous
+    return x[indices], y[indices]
+
+
+@memoize
+def get_air_mean():
+    """Returns the time and the mean air temperature over lat and lon"""
+    mean = air.mean(["lat", "lon"])
+    return mean["time"].values, mean.values
+
+
+def get_air_mean_curve(x_range=None, width=None, **kwargs):
+    """Returns the mean air temperature in the viewport downsampled to its width
+
+    Can be used as the callback of a `hv.DynamicMap` with `RangeX` and `PlotSize` streams.
+    """
+    time, value = get_air_mean()
+    if x_range is not None:
+        # Bokeh sends the range as milliseconds since epoch
+        start, end = np.searchsorted(
+            time, [pyramid._to_datetime64(x_range[0]), pyramid._to_datetime64(x_range[1])]
+        )
+        time, value = time[max(start - 1, 0) : end + 1], value[max(start - 1, 0) : end + 1]
+    time, value = lttb(time, value, max(width or 800, LTTB_MIN_POINTS))
+    return hv.Curve((time, value), "time", "air")
+
+
+def _load_holoviews():
+    global hv, opts, streams, DataLink
+    import holoviews as hv
+    from holoviews import opts, streams
+    from holoviews.plotting.links import DataLink
+
+    # The options of the example require a loaded plotting backend. Also outside of the page.
+    if not hv.Store.renderers:
+        hv.extension("bokeh")
+    return HoloViews
+
+
+def _load_hvplot():
+    global sprint
+    import hvplot.pandas  # noqa
+
+    from . import datasets
+
+    sprint = datasets.sprint()
+    return HVPlot
+
+
+def _load_datashader():
+    global air, hv, pyramid
+    import holoviews as hv
+    import hvplot.xarray  # noqa
+
+    from . import datasets, pyramid
+
+    air = datasets.air()
+    pyramid.get_pyramid()
+    return Datashader
+
+
+def _load_param():
+    return Param
+
+
+def _load_panel():
+    return Panel
+
+
+ALL = ComponentRegistry({
+    "HOLOVIEWS": _load_holoviews,
+    "HVPLOT": _load_hvplot,
+    "DATASHADER": _load_datashader,
+    "PARAM": _load_param,
+    "PANEL": _load_panel,
     # "COLORCET": Colorcet,
     # "GEOVIEWS": HVPlot,
-}
\ No newline at end of file
+})
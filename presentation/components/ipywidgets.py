@@ -2,16 +2,12 @@ import json
 from json import load
 from urllib.request import urlopen
 
-# import ipywidgets as ipw
-import ipysheet
-import pandas as pd
 import panel as pn
 import param
-from ipydatagrid import DataGrid
 
-import ipywidgets as ipw
+from .base import ComponentBase, ComponentRegistry
 
-from .base import ComponentBase
+# The libraries of each component are imported by its loader. See ALL below.
 
 
 class IPyWidgets(ComponentBase):
@@ -104,7 +100,7 @@ pn.extension("ipywidgets", sizing_mode="stretch_width")
         def get_widget(theme="default", accent_base_color="blue"):
 
             url = "https://raw.githubusercontent.com/bloomberg/ipydatagrid/main/examples/cars.json"
-            response = urlopen(url)
+            response = urlopen(url, timeout=10)
             json_data = response.read().decode('utf-8', 'replace')
             data = json.loads(json_data)
 
@@ -121,9 +117,38 @@ pn.extension("ipywidgets", sizing_mode="stretch_width")
         component = pn.panel(widget, height=500, width=500, sizing_mode="fixed")
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        # Reads the bundled copy of the data once instead of fetching it on every build
+        datagrid = DataGrid(datasets.datagrid_cars(), selection_mode="cell")
+        return pn.panel(pn.pane.IPyWidget(datagrid), height=500, width=500, sizing_mode="fixed")
+
+
+def _load_ipywidgets():
+    global ipw
+    import ipywidgets as ipw
+
+    return IPyWidgets
+
+
+def _load_ipysheet():
+    global ipysheet
+    import ipysheet
+
+    return IPySheet
+
+
+def _load_ipydatagrid():
+    global datasets, pd, DataGrid
+    import pandas as pd
+    from ipydatagrid import DataGrid
+
+    from . import datasets
+
+    return IPyDataGrid
+
 
-ALL = {
-    # "IPYDATAGRID": IPyDataGrid, # Not working: https://github.com/holoviz/panel/issues/2641
-    "IPYSHEET": IPySheet,
-    "IPyWidgets": IPyWidgets,
-}
+ALL = ComponentRegistry({
+    # "IPYDATAGRID": _load_ipydatagrid, # Not working: https://github.com/holoviz/panel/issues/2641
+    "IPYSHEET": _load_ipysheet,
+    "IPyWidgets": _load_ipywidgets,
+})
@@ -0,0 +1,169 @@
+"""Accounting of the bytes sent over the websocket per page and per component switch
+
+`install` hooks into the Bokeh websocket handler. Every message sent to a session with a meter is
+measured. The explorer pages create a meter for their session and `switch` it when a component is
+selected. The bytes and messages sent from then on are recorded for the component, including the
+patches of its models and data.
+
+A warning is logged when a component switch or the page in total exceeds its budget. The budgets
+can be configured via the `AWESOME_PANEL_COMPONENT_PAYLOAD_BUDGET` and
+`AWESOME_PANEL_PAGE_PAYLOAD_BUDGET` environment variables in bytes or per component via
+`set_budget`. The bytes and messages per component switch are logged when the session is
+destroyed.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import weakref
+
+from bokeh.server.views.ws import WSHandler
+
+COMPONENT_BUDGET = int(os.environ.get("AWESOME_PANEL_COMPONENT_PAYLOAD_BUDGET", 2**20))
+PAGE_BUDGET = int(os.environ.get("AWESOME_PANEL_PAGE_PAYLOAD_BUDGET", 5 * 2**20))
+BUDGETS = {}
+
+logger = logging.getLogger(__name__)
+
+_METERS = weakref.WeakKeyDictionary()
+_LOCK = threading.Lock()
+_send_message = None
+
+
+def set_budget(label: str, nbytes: int):
+    """Sets the payload budget in bytes of the component switches with the given label"""
+    BUDGETS[label] = nbytes
+
+
+def get_budget(label: str) -> int:
+    """Returns the payload budget in bytes of the component switches with the given label"""
+    return BUDGETS.get(label, COMPONENT_BUDGET)
+
+
+class PayloadMeter:
+    """Records the bytes and messages sent to a session per component switch"""
+
+    def __init__(self, name="page"):
+        self.name = name
+        self.switches = [{"label": "page", "bytes": 0, "messages": 0}]
+        self.bytes = 0
+        self.messages = 0
+        self._warned = set()
+
+    @property
+    def current(self) -> dict:
+        """The record of the current component switch"""
+        return self.switches[-1]
+
+    def switch(self, label: str):
+        """Starts recording the messages sent from now on for the component with the label"""
+        previous = self.current
+        logger.debug(
+            "%s: %s sent %s bytes in %s messages",
+            self.name,
+            previous["label"],
+            previous["bytes"],
+            previous["messages"],
+        )
+        self.switches.append({"label": label, "bytes": 0, "messages": 0})
+
+    def record(self, nbytes: int):
+        """Records a message of nbytes sent and warns if a budget is exceeded"""
+        current = self.current
+        current["bytes"] += nbytes
+        current["messages"] += 1
+        self.bytes += nbytes
+        self.messages += 1
+
+        index = len(self.switches) - 1
+        budget = get_budget(current["label"])
+        if current["bytes"] > budget and index not in self._warned:
+            self._warned.add(index)
+            logger.warning(
+                "%s: %s sent %s bytes. This exceeds its budget of %s bytes",
+                self.name,
+                current["label"],
+                current["bytes"],
+                budget,
+            )
+        if self.bytes > PAGE_BUDGET and "page" not in self._warned:
+            self._warned.add("page")
+            logger.warning(
+                "%s sent %s bytes. This exceeds the page budget of %s bytes",
+                self.name,
+                self.bytes,
+                PAGE_BUDGET,
+            )
+
+    def report(self) -> str:
+        """Returns a Markdown table of the bytes and messages sent per component switch"""
+        rows = ["| Component | Bytes | Messages |", "|-----------|-------|----------|"]
+        for switch in self.switches:
+            rows.append(f"| {switch['label']} | {switch['bytes']} | {switch['messages']} |")
+        rows.append(f"| Total | {self.bytes} | {self.messages} |")
+        return "\n".join(rows)
+
+
+def _log_report(meter, session_context):
+    logger.info("%s: Payload of session %s\n%s", meter.name, session_context.id, meter.report())
+
+
+def get_meter(doc, name="page") -> PayloadMeter:
+    """Returns the meter of the document. Creates it if it does not exist
+
+    The report of the meter is logged when the session of the document is destroyed.
+    """
+    with _LOCK:
+        if doc not in _METERS:
+            _METERS[doc] = meter = PayloadMeter(name)
+            if doc.session_context is not None:
+                doc.on_session_destroyed(functools.partial(_log_report, meter))
+        return _METERS[doc]
+
+
+def _get_text_size(text) -> int:
+    # Tornado sends a dict as a JSON text frame
+    if isinstance(text, dict):
+        text = json.dumps(text)
+    if isinstance(text, str):
+        text = text.encode()
+    return len(text)
+
+
+def get_size(message) -> int:
+    """Returns the number of bytes of the Bokeh protocol message"""
+    size = sum(
+        _get_text_size(text)
+        for text in (message.header_json, message.metadata_json, message.content_json)
+    )
+    for header, payload in message.buffers:
+        size += _get_text_size(header) + len(payload)
+    return size
+
+
+def _get_document(handler):
+    connection = getattr(handler, "connection", None)
+    session = getattr(connection, "_session", None)
+    return getattr(session, "document", None)
+
+
+async def _send_metered_message(self, message):
+    doc = _get_document(self)
+    meter = _METERS.get(doc, None) if doc is not None else None
+    if meter is not None:
+        # The accounting must never break sending the message
+        try:
+            meter.record(get_size(message))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Could not measure the size of the %s message", message.msgtype)
+    return await _send_message(self, message)
+
+
+def install():
+    """Hooks the payload accounting into the Bokeh websocket handler. Can be called repeatedly"""
+    global _send_message
+    with _LOCK:
+        if _send_message is None:
+            _send_message = WSHandler.send_message
+            WSHandler.send_message = _send_metered_message
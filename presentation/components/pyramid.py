@@ -0,0 +1,226 @@
+"""Precomputed multi-resolution aggregates of the `air` dataset
+
+The Datashader example plots every (time, air temperature) point of the `air` dataset. Instead of
+rasterizing the millions of points on every pan and zoom, the point counts are aggregated once
+into a pyramid of 2D histograms over time and temperature. Level 0 has one bin per time step and
+`VALUE_BINS` temperature bins. Each next level halves the resolution of both axes.
+
+The levels are stored in the data cache folder as `.npy` files using the smallest unsigned
+integer type that fits and are memory mapped. A viewport is served by picking the coarsest level
+with at least one bin per pixel and slicing it.
+
+Build the pyramid up front via
+
+```bash
+cd presentation
+python -m components.pyramid
+```
+"""
+import functools
+import json
+import pathlib
+
+import numpy as np
+
+from .datasets import DATA_PATH, _write
+
+PYRAMID_PATH = DATA_PATH / "air_pyramid"
+VALUE_BINS = 1024
+MIN_BINS = 32
+MIN_SLICE = 2
+CHUNK_SIZE = 256
+
+
+def _to_datetime64(value) -> np.datetime64:
+    if isinstance(value, (int, float, np.number)):
+        # Bokeh sends datetimes as milliseconds since epoch
+        return np.datetime64(int(value * 1e6), "ns")
+    return np.datetime64(value, "ns")
+
+
+def _get_slice(start: float, end: float, size: int) -> slice:
+    """Returns the slice of the bins from start to end clamped to the bins
+
+    At least `MIN_SLICE` bins are returned. So a viewport that is outside of the data, inverted
+    or empty still gives an image. HoloViews cannot infer the bounds of an image with a single
+    bin.
+    """
+    if not (np.isfinite(start) and np.isfinite(end)):
+        return slice(0, size)
+    first = int(np.clip(np.floor(start), 0, size - MIN_SLICE))
+    stop = int(np.clip(np.ceil(end), first + MIN_SLICE, size))
+    return slice(first, stop)
+
+
+def _get_dtype(counts: np.ndarray):
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if counts.max(initial=0) <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+def _downsample(counts: np.ndarray) -> np.ndarray:
+    """Sums each 2x2 block of bins. An odd last row or column is kept as a block of its own"""
+    rows, columns = counts.shape
+    counts = np.pad(counts.astype(np.uint64), ((0, rows % 2), (0, columns % 2)))
+    return counts.reshape(counts.shape[0] // 2, 2, counts.shape[1] // 2, 2).sum(axis=(1, 3))
+
+
+def aggregate(values: np.ndarray, low: float, high: float, value_bins=VALUE_BINS) -> np.ndarray:
+    """Returns the counts of the values per first axis index and value bin"""
+    values = np.asarray(values).reshape(len(values), -1)
+    bins = ((values - low) / (high - low) * value_bins).astype(np.int64)
+    np.clip(bins, 0, value_bins - 1, out=bins)
+    index = bins + np.arange(len(values))[:, None] * value_bins
+    return np.bincount(index.ravel(), minlength=len(values) * value_bins).reshape(
+        len(values), value_bins
+    )
+
+
+class Pyramid:
+    """A pyramid of counts over time and value
+
+    Args:
+        levels (list): The counts of each level as arrays of shape (time bins, value bins).
+        start (np.datetime64): The start of the first time bin.
+        step (np.timedelta64): The width of the time bins of level 0.
+        low (float): The lower edge of the first value bin.
+        high (float): The upper edge of the last value bin.
+    """
+
+    def __init__(self, levels, start, step, low, high):
+        self.levels = levels
+        self.start = np.datetime64(start, "ns")
+        self.step = np.timedelta64(step, "ns")
+        self.low = low
+        self.high = high
+
+    @classmethod
+    def build(
+        cls, data, value_bins=VALUE_BINS, min_bins=MIN_BINS, chunk_size=CHUNK_SIZE
+    ) -> "Pyramid":
+        """Builds the pyramid from a DataArray with a regular `time` as first dimension
+
+        The values are aggregated `chunk_size` time steps at a time. So a Dask backed DataArray is
+        never loaded into memory as a whole.
+        """
+        low, high = float(data.min()), float(data.max())
+        time = data["time"].values
+        counts = np.concatenate(
+            [
+                aggregate(np.asarray(data[start : start + chunk_size].values), low, high, value_bins)
+                for start in range(0, len(time), chunk_size)
+            ]
+        )
+        levels = [counts.astype(_get_dtype(counts))]
+        while min(levels[-1].shape) // 2 >= min_bins:
+            counts = _downsample(counts)
+            levels.append(counts.astype(_get_dtype(counts)))
+        return cls(levels, time[0], time[1] - time[0], low, high)
+
+    def save(self, path: pathlib.Path):
+        """Saves the pyramid to the folder"""
+        for index, level in enumerate(self.levels):
+            _write(path / f"level_{index}.npy", functools.partial(np.save, arr=level))
+        meta = {
+            "levels": len(self.levels),
+            "start": str(self.start),
+            "step": int(self.step.astype(np.int64)),
+            "low": self.low,
+            "high": self.high,
+        }
+        _write(path / "meta.json", lambda file: pathlib.Path(file).write_text(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "Pyramid":
+        """Loads the pyramid from the folder. The levels are memory mapped and read-only"""
+        meta = json.loads((path / "meta.json").read_text())
+        levels = [
+            np.load(path / f"level_{index}.npy", mmap_mode="r") for index in range(meta["levels"])
+        ]
+        return cls(
+            levels,
+            np.datetime64(meta["start"]),
+            np.timedelta64(meta["step"], "ns"),
+            meta["low"],
+            meta["high"],
+        )
+
+    def get_level(self, time_bins: float, value_bins: float, width=800, height=400) -> int:
+        """Returns the coarsest level with at least one bin per pixel in the viewport
+
+        Args:
+            time_bins (float): The number of level 0 time bins in the viewport.
+            value_bins (float): The number of level 0 value bins in the viewport.
+            width (int): The width of the viewport in pixels.
+            height (int): The height of the viewport in pixels.
+        """
+        level = 0
+        while (
+            level + 1 < len(self.levels)
+            and time_bins / 2 ** (level + 1) >= width
+            and value_bins / 2 ** (level + 1) >= height
+        ):
+            level += 1
+        return level
+
+    def select(self, x_range=None, y_range=None, width=800, height=400):
+        """Returns the time bin centers, value bin centers and counts of the viewport
+
+        Args:
+            x_range (tuple): The (start, end) time of the viewport. Defaults to the full range.
+            y_range (tuple): The (low, high) value of the viewport. Defaults to the full range.
+            width (int): The width of the viewport in pixels.
+            height (int): The height of the viewport in pixels.
+        """
+        time_bins, value_bins = self.levels[0].shape
+        value_step = (self.high - self.low) / value_bins
+        if x_range is None:
+            time_start, time_end = 0, time_bins
+        else:
+            time_start = (_to_datetime64(x_range[0]) - self.start) / self.step
+            time_end = (_to_datetime64(x_range[1]) - self.start) / self.step + 1
+        if y_range is None:
+            value_start, value_end = 0, value_bins
+        else:
+            value_start = (y_range[0] - self.low) / value_step
+            value_end = (y_range[1] - self.low) / value_step + 1
+
+        level = self.get_level(
+            time_end - time_start, value_end - value_start, width or 800, height or 400
+        )
+        factor = 2 ** level
+        counts = self.levels[level]
+        rows = _get_slice(time_start / factor, time_end / factor, counts.shape[0])
+        columns = _get_slice(value_start / factor, value_end / factor, counts.shape[1])
+        times = self.start + self.step * factor * (np.arange(rows.start, rows.stop) + 0.5)
+        values = self.low + value_step * factor * (np.arange(columns.start, columns.stop) + 0.5)
+        return times, values, counts[rows, columns]
+
+    def get_image(self, x_range=None, y_range=None, width=None, height=None, **kwargs):
+        """Returns a HoloViews Image of the counts in the viewport. Empty bins are transparent
+
+        Can be used as the callback of a `hv.DynamicMap` with `RangeXY` and `PlotSize` streams.
+        """
+        import holoviews as hv
+
+        times, values, counts = self.select(x_range, y_range, width, height)
+        counts = counts.T.astype(np.float32)
+        counts[counts == 0] = np.nan
+        return hv.Image((times, values, counts), kdims=["time", "air"], vdims=["count"])
+
+
+@functools.lru_cache(maxsize=None)
+def get_pyramid() -> Pyramid:
+    """Returns the pyramid of the `air` dataset. Builds and stores it on first use"""
+    if not (PYRAMID_PATH / "meta.json").exists():
+        from . import datasets
+
+        Pyramid.build(datasets.air()).save(PYRAMID_PATH)
+    return Pyramid.load(PYRAMID_PATH)
+
+
+if __name__ == "__main__":
+    pyramid = get_pyramid()
+    for index, level in enumerate(pyramid.levels):
+        print(f"Level {index}: {level.shape} {level.dtype} {level.nbytes} bytes")
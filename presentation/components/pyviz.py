@@ -1,41 +1,14 @@
 import json
 from html import escape  # noqa
 
-import altair as alt
-import folium
-import holoviews as hv
-import hvplot.pandas  # noqa
-import hvplot.xarray  # noqa
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import panel as pn
 import param
-import plotly.express as px
-import pydeck
-import pyvista as pv
-import seaborn as sns
-import vtk
-import xarray as xr
-from bokeh.plotting import figure
-from bokeh.sampledata.sprint import sprint
-from holoviews import opts, streams
-from holoviews.plotting.links import DataLink
-from matplotlib import cm
-from matplotlib.backends.backend_agg import \
-    FigureCanvas  # not needed for mpl >= 3.1
-from matplotlib.figure import Figure
-from plotnine import (aes, element_rect, facet_wrap, geom_point, ggplot,
-                      stat_smooth, themes)
-from plotnine.data import mtcars
-from pyecharts.charts import Bar
-from scipy.integrate import odeint
-from vega_datasets import data
-from vtk.util.colors import tomato
-from .base import ComponentBase
 
-penguins = sns.load_dataset("penguins")
-air = xr.tutorial.open_dataset("air_temperature").load().air
+from . import render
+from .base import ComponentBase, ComponentRegistry, memoize
+
+# The libraries and data of each component are imported by its loader. See ALL below.
 
 class Altair(ComponentBase):
     component = param.Parameter("pn.pane.Vega")
@@ -49,6 +22,8 @@ import panel as pn
 from vega_datasets import data
 
 pn.extension("vega", sizing_mode="stretch_width")
+
+cars = data.cars()
 """
     )
 
@@ -60,7 +35,7 @@ pn.extension("vega", sizing_mode="stretch_width")
                 alt.themes.enable("default")
 
             return (
-                alt.Chart(data.cars())
+                alt.Chart(cars)
                 .mark_circle(size=60)
                 .encode(
                     x="Horsepower",
@@ -94,12 +69,8 @@ pn.extension(sizing_mode="stretch_width")
 """
 
     def example(self, theme="default", accent_base_color="blue"):
-        def get_plot(theme="default", accent_base_color="blue"):
-            sigma = 10
-            rho = 28
-            beta = 8.0 / 3
-            theta = 3 * np.pi / 4
-
+        @memoize(disk=True)
+        def get_lorenz(sigma=10, rho=28, beta=8.0 / 3, theta=3 * np.pi / 4):
             def lorenz(xyz, t):
                 x, y, z = xyz
                 x_dot = sigma * (y - x)
@@ -116,6 +87,10 @@ pn.extension(sizing_mode="stretch_width")
             y = solution[:, 1]
             z = solution[:, 2]
             xprime = np.cos(theta) * x - np.sin(theta) * y
+            return xprime, z
+
+        def get_plot(theme="default", accent_base_color="blue"):
+            xprime, z = get_lorenz()
 
             colors = [
                 "#C6DBEF",
@@ -200,6 +175,11 @@ pn.extension("deckgl", sizing_mode="stretch_width")
         )
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        component = self.example(theme=theme, accent_base_color=accent_base_color)
+        component.object["layers"][0]["data"] = _get_data_url("heatmap-data")
+        return component
+
 
 class ECharts(ComponentBase):
     component = param.Parameter(pn.pane.ECharts)
@@ -308,14 +288,18 @@ pn.extension(sizing_mode="stretch_width")
 """
 
     def example(self, theme="default", accent_base_color="blue"):
+        @memoize
+        def get_field():
+            Y, X = np.mgrid[-3:3:100j, -3:3:100j]
+            U = -1 - X ** 2 + Y
+            V = 1 + X - Y ** 2
+            return X, Y, U, V
+
         def get_plot(theme="default", accent_base_color="blue"):
             plt.style.use("default")
             if theme == "dark":
                 plt.style.use("dark_background")
-            Y, X = np.mgrid[-3:3:100j, -3:3:100j]
-            U = -1 - X ** 2 + Y
-            V = 1 + X - Y ** 2
-            speed = np.sqrt(U * U + V * V)
+            X, Y, U, V = get_field()
 
             fig0 = Figure(figsize=(12, 6))
             ax0 = fig0.subplots()
@@ -329,6 +313,17 @@ pn.extension(sizing_mode="stretch_width")
         component = pn.pane.Matplotlib(plot, height=500, sizing_mode="stretch_both")
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        # The figure does not use the accent color. So it is rendered once per theme only
+        return render.get_example_pane(
+            self,
+            theme=theme,
+            doc=doc,
+            size=(12, 6),
+            height=500,
+            sizing_mode="stretch_both",
+        )
+
 
 class Plotly(ComponentBase):
     component = param.Parameter(pn.pane.Plotly)
@@ -423,6 +418,17 @@ pn.extension(sizing_mode="stretch_width")
         component = pn.pane.Matplotlib(plot, height=500, sizing_mode="stretch_both")
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        # The figure does not use the accent color. So it is rendered once per theme only
+        return render.get_example_pane(
+            self,
+            theme=theme,
+            doc=doc,
+            size=(16, 8),
+            height=500,
+            sizing_mode="stretch_both",
+        )
+
 
 class PyDeck(ComponentBase):
     component = param.Parameter(pn.pane.DeckGL)
@@ -496,6 +502,11 @@ pn.extension("deckgl", sizing_mode="stretch_width")
         component = pn.pane.DeckGL(plot, tooltips=tooltips, height=500, sizing_mode="stretch_both")
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        component = self.example(theme=theme, accent_base_color=accent_base_color)
+        component.object.layers[1].data = _get_data_url("vancouver-blocks-data")
+        return component
+
 
 class PyECharts(ComponentBase):
     component = param.Parameter(pn.pane.ECharts)
@@ -606,6 +617,16 @@ penguins = sns.load_dataset("penguins")
         component = pn.pane.Matplotlib(plot, sizing_mode="stretch_both")
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        return render.get_example_pane(
+            self,
+            theme=theme,
+            doc=doc,
+            accent_base_color=accent_base_color,
+            size=(16, 8),
+            sizing_mode="stretch_both",
+        )
+
 
 class Vega(ComponentBase):
     component = param.Parameter("pn.pane.Vega")
@@ -647,6 +668,11 @@ pn.extension("vega", sizing_mode="stretch_width")
         component = pn.pane.Vega(plot, height=500, sizing_mode="stretch_both")
         return component
 
+    def view(self, theme="default", accent_base_color="blue", doc=None):
+        component = self.example(theme=theme, accent_base_color=accent_base_color)
+        component.object["data"]["url"] = _get_data_url("barley-data")
+        return component
+
 
 class VTK(ComponentBase):
     component = param.Parameter("pn.pane.VTK")
@@ -703,19 +729,134 @@ pn.extension("vtk", sizing_mode="stretch_width")
         component = pn.pane.VTK(plot, height=500, sizing_mode="stretch_both")
         return component
 
-ALL = {
-    "ALTAIR": Altair,
-    "BOKEH": Bokeh,
-    "DECKGL": DeckGL,
-    "ECHARTS": ECharts,
-    "FOLIUM": Folium,
-    "MATPLOTLIB": Matplotlib,
-    "PLOTLY": Plotly,
-    "PLOTNINE": Plotnine,
-    "PYDECK": PyDeck,
-    "PYECHARTS": PyECharts,
-    "PYVISTA": PyVista,
-    "SEABORN": Seaborn,
-    "VEGA": Vega,
-    "VTK": VTK,
-}
\ No newline at end of file
+
+def _get_data_url(name):
+    """Returns the url of the dataset. Served by our own server if mirrored. See shared.assets"""
+    from shared import assets
+
+    return assets.get_url(name)
+
+
+def _load_altair():
+    global alt, cars
+    import altair as alt
+
+    from . import datasets
+
+    cars = datasets.cars()
+    return Altair
+
+
+def _load_bokeh():
+    global figure, odeint
+    from bokeh.plotting import figure
+    from scipy.integrate import odeint
+
+    return Bokeh
+
+
+def _load_deckgl():
+    return DeckGL
+
+
+def _load_echarts():
+    return ECharts
+
+
+def _load_folium():
+    global folium
+    import folium
+
+    return Folium
+
+
+def _load_matplotlib():
+    global plt, cm, FigureCanvas, Figure
+    import matplotlib.pyplot as plt
+    from matplotlib import cm
+    from matplotlib.backends.backend_agg import FigureCanvas  # not needed for mpl >= 3.1
+    from matplotlib.figure import Figure
+
+    return Matplotlib
+
+
+def _load_plotly():
+    global pd, px
+    import pandas as pd
+    import plotly.express as px
+
+    return Plotly
+
+
+def _load_plotnine():
+    global plt, aes, element_rect, facet_wrap, geom_point, ggplot, stat_smooth, themes, mtcars
+    import matplotlib.pyplot as plt
+    from plotnine import (aes, element_rect, facet_wrap, geom_point, ggplot,
+                          stat_smooth, themes)
+
+    from . import datasets
+
+    mtcars = datasets.mtcars()
+    return Plotnine
+
+
+def _load_pydeck():
+    global pydeck
+    import pydeck
+
+    return PyDeck
+
+
+def _load_pyecharts():
+    global Bar
+    from pyecharts.charts import Bar
+
+    return PyECharts
+
+
+def _load_pyvista():
+    global pv
+    import pyvista as pv
+
+    return PyVista
+
+
+def _load_seaborn():
+    global plt, sns, penguins
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    from . import datasets
+
+    penguins = datasets.penguins()
+    return Seaborn
+
+
+def _load_vega():
+    return Vega
+
+
+def _load_vtk():
+    global vtk, tomato
+    import vtk
+    from vtk.util.colors import tomato
+
+    return VTK
+
+
+ALL = ComponentRegistry({
+    "ALTAIR": _load_altair,
+    "BOKEH": _load_bokeh,
+    "DECKGL": _load_deckgl,
+    "ECHARTS": _load_echarts,
+    "FOLIUM": _load_folium,
+    "MATPLOTLIB": _load_matplotlib,
+    "PLOTLY": _load_plotly,
+    "PLOTNINE": _load_plotnine,
+    "PYDECK": _load_pydeck,
+    "PYECHARTS": _load_pyecharts,
+    "PYVISTA": _load_pyvista,
+    "SEABORN": _load_seaborn,
+    "VEGA": _load_vega,
+    "VTK": _load_vtk,
+})
@@ -0,0 +1,182 @@
+"""Cache of rendered Matplotlib figures
+
+Rasterizing a Matplotlib figure with Agg is slow. The Matplotlib, Seaborn and Plotnine examples
+only depend on a small, finite set of inputs like the theme and accent color. So each figure is
+rendered once per key, size, dpi and format and the encoded bytes are stored in a SQLite file in
+the data cache folder, shared by all processes. After warmup the panes are served from the cache
+without any rendering on the request path. The renderings stored first are evicted when the file
+holds more than `RENDER_BYTES`.
+
+By default a figure that is not in the cache is rendered on the thread of the request. This
+blocks the IOLoop and thus every other session of the worker. Set the
+`AWESOME_PANEL_RENDER_PROCESSES` environment variable to a number of processes to render the
+example figures in a process pool instead. Only the encoded bytes are sent back. The pane is
+shown with a loading indicator and updated when the bytes arrive. If the rendering fails in the
+pool, the figure is rendered inline instead.
+"""
+import concurrent.futures
+import functools
+import importlib
+import io
+import logging
+import multiprocessing
+import os
+import pathlib
+import site
+import threading
+
+import panel as pn
+
+DPI = 144
+FORMATS = {"png": pn.pane.PNG, "svg": pn.pane.SVG}
+PROCESSES = int(os.environ.get("AWESOME_PANEL_RENDER_PROCESSES", "0"))
+RENDER_BYTES = 2**27
+PRESENTATION_PATH = pathlib.Path(__file__).parents[1]
+
+# The pyplot styles and state are global. So figures are created and rendered one at a time.
+_LOCK = threading.RLock()
+_PENDING = {}
+_PENDING_LOCK = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def render(figure, size=None, dpi=DPI, format="png") -> bytes:
+    """Returns the figure encoded as png or svg bytes. Like the `pn.pane.Matplotlib` pane does"""
+    import matplotlib.pyplot as plt
+
+    if size is not None:
+        figure.set_size_inches(*size)
+    figure.set_dpi(dpi)
+    buffer = io.BytesIO()
+    try:
+        figure.canvas.print_figure(buffer, format=format)
+    finally:
+        # Figures created via pyplot are kept alive by pyplot until closed
+        plt.close(figure)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cache():
+    # Not the AWESOME_PANEL_CACHE backend. The shared_memory backend only fits small values
+    from shared.cache import SQLiteCache
+
+    from .datasets import DATA_PATH
+
+    DATA_PATH.mkdir(parents=True, exist_ok=True)
+    return SQLiteCache(DATA_PATH / "render.sqlite", max_bytes=RENDER_BYTES)
+
+
+def get_rendered(key, get_figure, size=None, dpi=DPI, format="png") -> bytes:
+    """Returns the encoded bytes of the figure returned by `get_figure()`
+
+    The figure is only created and rendered the first time the key, size, dpi and format is
+    requested.
+    """
+    key = ("render", *key, size, dpi, format)
+
+    def _render():
+        with _LOCK:
+            return render(get_figure(), size=size, dpi=dpi, format=format)
+
+    return _get_cache().get_or_compute(key, _render)
+
+
+def get_pane(key, get_figure, size=None, dpi=DPI, format="png", **params):
+    """Returns a PNG or SVG pane of the cached rendering of the figure returned by `get_figure()`"""
+    data = get_rendered(key, get_figure, size=size, dpi=dpi, format=format)
+    return FORMATS[format](io.BytesIO(data), **params)
+
+
+@functools.lru_cache(maxsize=None)
+def get_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """Returns the process pool rendering the example figures"""
+    # Forking a process running the IOLoop and other threads is not safe
+    context = multiprocessing.get_context("spawn")
+    # `panel serve` only puts the `presentation` folder on the path while a page runs. The workers
+    # need it to import the `components`. The initializer must be importable without it.
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=PROCESSES,
+        mp_context=context,
+        initializer=site.addsitedir,
+        initargs=(str(PRESENTATION_PATH),),
+    )
+
+
+def render_example(module, name, theme, accent_base_color, size=None, dpi=DPI, format="png"):
+    """Returns the encoded bytes of the example figure of the component
+
+    Runs in the process pool. So the component is looked up by the module and name of its
+    registry.
+    """
+    component = importlib.import_module(module).ALL[name]()
+    figure = component.example(theme=theme, accent_base_color=accent_base_color).object
+    return render(figure, size=size, dpi=dpi, format=format)
+
+
+def _submit(key, args):
+    with _PENDING_LOCK:
+        if key not in _PENDING:
+            future = get_executor().submit(render_example, *args)
+            _PENDING[key] = future
+            future.add_done_callback(lambda future: _PENDING.pop(key, None))
+        return _PENDING[key]
+
+
+def get_example_pane(
+    component,
+    theme="default",
+    accent_base_color="blue",
+    doc=None,
+    size=None,
+    dpi=DPI,
+    format="png",
+    **params,
+):
+    """Returns a PNG or SVG pane of the cached rendering of the example figure of the component
+
+    The `example` of the component must return a pane of a Matplotlib figure. If the rendering is
+    not cached, the process pool is enabled and the `doc` of a server session is given, the pane
+    is returned right away with a loading indicator. It is updated when the rendering is done.
+    """
+    cache_key = (str(component), theme, accent_base_color)
+    key = ("render", *cache_key, size, dpi, format)
+    cache = _get_cache()
+
+    def _get_figure():
+        return component.example(theme=theme, accent_base_color=accent_base_color).object
+
+    if not PROCESSES or key in cache or doc is None or doc.session_context is None:
+        return get_pane(
+            cache_key,
+            _get_figure,
+            size=size,
+            dpi=dpi,
+            format=format,
+            **params,
+        )
+
+    pane = FORMATS[format](None, loading=True, **params)
+
+    def _update(data):
+        pane.object = io.BytesIO(data)
+        pane.loading = False
+
+    def _done(future):
+        try:
+            data = cache.get_or_compute(key, future.result)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Rendering %s in the process pool failed. Rendering inline", cache_key)
+            try:
+                data = get_rendered(cache_key, _get_figure, size=size, dpi=dpi, format=format)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Rendering %s failed", cache_key)
+                doc.add_next_tick_callback(functools.partial(setattr, pane, "loading", False))
+                return
+        doc.add_next_tick_callback(functools.partial(_update, data))
+
+    module = type(component).__module__
+    args = (module, str(component), theme, accent_base_color, size, dpi, format)
+    _submit(key, args).add_done_callback(_done)
+    return pane
@@ -0,0 +1,146 @@
+"""Warms up the components before the server accepts traffic
+
+The first user to select a component would otherwise pay for importing its libraries, loading
+its data, compiling its numba functions, rendering its first figure etc. The warmup loads every
+registered component in a thread pool and builds its view and code for each theme and accent
+color. The views are built on the build thread of the explorer, one at a time, because they set
+process global state like the Altair and HoloViews themes.
+
+`python -m shared.server` runs the warmup in each worker process at start and reports the
+progress on the `/ready` endpoint. It responds with status 503 until the worker is warm. Point the
+health check of your load balancer to it.
+
+You can also run the warmup standalone to see the time it takes per component
+
+```bash
+cd presentation
+python -m components.warmup
+```
+"""
+import concurrent.futures
+import json
+import logging
+import threading
+import time
+import traceback
+
+import panel as pn
+from bokeh.document import Document
+
+from .explorer import _BUILD_EXECUTOR
+
+THEMES = ("default", "dark")
+ACCENT_BASE_COLORS = ("blue",)
+MAX_WORKERS = 4
+
+logger = logging.getLogger(__name__)
+
+
+def _build(component, theme, accent_base_color):
+    view = component.view(theme=theme, accent_base_color=accent_base_color)
+    pn.panel(view).get_root(Document())
+
+
+def get_registries():
+    """Returns the component registries of the explorer pages"""
+    from . import holoviz, ipywidgets, pyviz
+
+    return [pyviz.ALL, holoviz.ALL, ipywidgets.ALL]
+
+
+class Warmup:
+    """Warms up the components of the registries in a thread pool
+
+    Args:
+        registries (list): The component registries. Defaults to the ones of the explorer pages.
+        themes (tuple): The themes to build the views for.
+        accent_base_colors (tuple): The accent colors to build the views and code for.
+        max_workers (int): The number of threads.
+    """
+
+    def __init__(
+        self,
+        registries=None,
+        themes=THEMES,
+        accent_base_colors=ACCENT_BASE_COLORS,
+        max_workers=MAX_WORKERS,
+    ):
+        self._registries = registries
+        self.themes = tuple(themes)
+        self.accent_base_colors = tuple(accent_base_colors)
+        self.max_workers = max_workers
+        self.times = {}
+        self.errors = {}
+        self.elapsed = None
+        self._done = threading.Event()
+        self._thread = None
+
+    @property
+    def registries(self):
+        """The component registries to warm up"""
+        if self._registries is None:
+            self._registries = get_registries()
+        return self._registries
+
+    @property
+    def ready(self) -> bool:
+        """True when all components have been warmed up"""
+        return self._done.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        """Waits for the warmup to finish. Returns True if it finished"""
+        return self._done.wait(timeout)
+
+    def start(self):
+        """Starts the warmup in a background thread. Returns immediately"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def run(self):
+        """Runs the warmup and returns when it has finished"""
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="warmup"
+        ) as executor:
+            futures = [
+                executor.submit(self._warm, registry, name)
+                for registry in self.registries
+                for name in registry
+            ]
+            concurrent.futures.wait(futures)
+        self.elapsed = time.perf_counter() - start
+        self._done.set()
+        logger.info("Warmup finished in %.1f seconds", self.elapsed)
+
+    def _warm(self, registry, name):
+        start = time.perf_counter()
+        try:
+            component = registry[name]()
+            for accent_base_color in self.accent_base_colors:
+                component.code(accent_base_color=accent_base_color)
+                for theme in self.themes:
+                    _BUILD_EXECUTOR.submit(_build, component, theme, accent_base_color).result()
+        except Exception:  # pylint: disable=broad-except
+            self.errors[name] = traceback.format_exc(limit=3)
+            logger.warning("Warmup of %s failed\n%s", name, self.errors[name])
+        self.times[name] = time.perf_counter() - start
+
+    def report(self) -> dict:
+        """Returns the progress of the warmup and the time in seconds per component"""
+        return {
+            "ready": self.ready,
+            "elapsed": self.elapsed,
+            "components": {
+                name: {"seconds": self.times.get(name, None), "error": self.errors.get(name, None)}
+                for registry in self.registries
+                for name in registry
+            },
+        }
+
+
+if __name__ == "__main__":
+    warmup = Warmup()
+    warmup.run()
+    print(json.dumps(warmup.report(), indent=2))
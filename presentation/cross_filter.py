@@ -1,5 +1,10 @@
 # pip install panel==0.12.4 bokeh==2.4.0 holoviews==1.14.6 hvplot==0.7.3 shapely==1.7.1
 # panel serve holoviz_linked_brushing.py --autoreload --show
+#
+# Set the AWESOME_PANEL_CROSS_FILTER_ROWS environment variable to for example 10000000 to cross
+# filter a large, generated version of the dataset. See components/cross_filter.py
+import os
+
 import holoviews as hv
 import hvplot.pandas
 import panel as pn
@@ -10,24 +15,37 @@ hv.extension("bokeh")
 
 accent_color = "#ff286e"
 
-scatter = flowers.hvplot.scatter(
-    x="sepal_length", y="sepal_width", c=accent_color, responsive=True, height=350
-)
-hist = flowers.hvplot.hist("petal_width", c=accent_color, responsive=True, height=350)
+rows = int(os.environ.get("AWESOME_PANEL_CROSS_FILTER_ROWS", "0"))
+
+if rows:
+    from components.cross_filter import CrossFilter, get_flowers_index
+
+    cross_filter = CrossFilter(get_flowers_index(rows), x="sepal_length", y="sepal_width")
+    scatter = cross_filter.get_scatter(accent_color, responsive=True, height=350)
+    hist = cross_filter.get_hist(accent_color, responsive=True, height=350)
+    clear = pn.widgets.Button(name="Clear selection", width=150, sizing_mode="fixed")
+    clear.on_click(cross_filter.clear)
+    main = [clear, scatter, hist]
+else:
+    scatter = flowers.hvplot.scatter(
+        x="sepal_length", y="sepal_width", c=accent_color, responsive=True, height=350
+    )
+    hist = flowers.hvplot.hist("petal_width", c=accent_color, responsive=True, height=350)
 
-scatter.opts(size=10)
+    scatter.opts(size=10)
 
-selection_linker = hv.selection.link_selections.instance()
+    selection_linker = hv.selection.link_selections.instance()
 
-scatter = selection_linker(scatter)
-hist = selection_linker(hist)
+    scatter = selection_linker(scatter)
+    hist = selection_linker(hist)
 
-scatter.opts(tools=["hover"], active_tools=["box_select"])
-hist.opts(tools=["hover"], active_tools=["box_select"])
+    scatter.opts(tools=["hover"], active_tools=["box_select"])
+    hist.opts(tools=["hover"], active_tools=["box_select"])
+    main = [scatter, hist]
 
 pn.template.FastListTemplate(
     site="Awesome Panel and HoloViews",
     title="Cross Filtering/ Linked Brushing",
     header_background=accent_color,
-    main=[scatter, hist],
+    main=main,
 ).servable()
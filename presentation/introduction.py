@@ -1,6 +1,7 @@
 import panel as pn
 
 from shared import Configuration
+from shared.assets import get_pane
 
 RAW_CSS="""
 .bk-root h1 {
@@ -34,12 +35,11 @@ top = f"""
 
 """
 
-gif = pn.pane.PNG(
-    "https://github.com/MarcSkovMadsen/awesome-panel-introduction/blob/main/assets/videos/awesome-panel-introduction-tour.gif?raw=true",
+gif = get_pane(
+    "introduction-tour",
     height=422,
     width=786,
     link_url="https://panel.holoviz.org",
-    embed=False,
     sizing_mode="fixed",
     align="center",
     margin=0,
@@ -1,10 +1,17 @@
+import functools
 import pathlib
 import random
-import sys
+import re
+import string
+import weakref
 
 import panel as pn
 import param
 
+from . import reload
+from .assets import PNG, get_url
+from .cache import get_cache
+
 _COLORS = [
     ("#00A170", "white"),
     ("#DAA520", "white"),
@@ -12,14 +19,38 @@ _COLORS = [
     ("#F08080", "white"),
     ("#4099da", "white"), # lightblue
 ]
+ACCENT_BASE_COLORS = tuple(color for color, _ in _COLORS)
 _LOGOS = {
-    "default": "https://panel.holoviz.org/_static/logo_stacked.png",
-    "dark": "https://raw.githubusercontent.com/holoviz/panel/98389a8dead125bcb7c60dc2c1564e112d89d3fa/doc/_static/logo_stacked_dark_theme.png",
+    "default": "panel-logo",
+    "dark": "panel-logo-dark",
 }
 
 
 _MENU_FILE = pathlib.Path(__file__).parent / "menu.html"
 _MENU_TEXT = _MENU_FILE.read_text()
+_MENU_ITEM = re.compile(r'<li><a href="([^"]+)">')
+_MENU_ITEM_ACTIVE = ' class="menu-item-active"'
+
+def _compile_menu(text: str):
+    """Compiles the menu text into a Template with slots for the icons and the active menu item
+
+    Returns:
+        The Template and the list of menu item urls. The slot of the i'th url is named `active_i`.
+    """
+    urls = []
+    def _slot(match):
+        urls.append(match.group(1))
+        return f'<li${{active_{ len(urls)-1 }}}><a href="{ match.group(1) }">'
+
+    text = _MENU_ITEM.sub(_slot, text.replace("$", "$$"))
+    text = (
+        text
+        .replace("{ COLLAPSED_ICON }", "${collapsed_icon}")
+        .replace("{ EXPANDED_ICON }", "${expanded_icon}")
+    )
+    return string.Template(text), urls
+
+_MENU_TEMPLATE, _MENU_URLS = _compile_menu(_MENU_TEXT)
 
 _ACE_THEMES={
     "default": "chrome",
@@ -36,23 +67,61 @@ if not RAW_CSS in pn.config.raw_css:
     pn.config.raw_css.append(RAW_CSS)
 
 def _mock_panel():
-    def _reload(module=None):
-        if module is not None:
-            for module in pn.io.reload._modules:
-                if module in sys.modules:
-                    del sys.modules[module]
-        for cb in pn.io.reload._callbacks.values():
-            cb.stop()
-        pn.io.reload._callbacks.clear()
-        if pn.state.location:
-            pn.state.location.reload = True
-        for loc in pn.state._locations.values():
-            loc.reload = True
-
-    pn.io.reload._reload = _reload
+    reload.install()
 
 _mock_panel()
-#tests
+
+_SESSION_THEMES = weakref.WeakKeyDictionary()
+
+def _get_theme_from_session_args() -> str:
+    theme = pn.state.session_args.get("theme", None)
+    if not theme:
+        return "default"
+    theme = theme[0].decode("utf-8").strip("'").strip('"')
+    if theme not in _ACE_THEMES:
+        return "default"
+    return theme
+
+def get_theme() -> str:
+    """Returns the theme of the current session. Either "default" or "dark".
+
+    The theme is read from the `theme` query argument, just like the `FastListTemplate` does, and
+    memoized per session. This saves us from building a template just to find its theme."""
+    doc = pn.state.curdoc
+    if doc is None:
+        return _get_theme_from_session_args()
+    if not doc in _SESSION_THEMES:
+        _SESSION_THEMES[doc] = _get_theme_from_session_args()
+    return _SESSION_THEMES[doc]
+
+@functools.lru_cache(maxsize=None)
+def _get_collapsed_icon(accent_base_color: str) -> str:
+    return f"""<svg style="stroke: { accent_base_color }" width="18" height="18" viewBox="0 0 18 18" fill="none" xmlns="http://www.w3.org/2000/svg" slot="collapsed-icon">
+<path d="M15.2222 1H2.77778C1.79594 1 1 1.79594 1 2.77778V15.2222C1 16.2041 1.79594 17 2.77778 17H15.2222C16.2041 17 17 16.2041 17 15.2222V2.77778C17 1.79594 16.2041 1 15.2222 1Z" stroke-linecap="round" stroke-linejoin="round"></path>
+<path d="M9 5.44446V12.5556" stroke-linecap="round" stroke-linejoin="round"></path>
+<path d="M5.44446 9H12.5556" stroke-linecap="round" stroke-linejoin="round"></path>
+</svg>"""
+
+@functools.lru_cache(maxsize=None)
+def _get_expanded_icon(accent_base_color: str) -> str:
+    return f"""<svg style="stroke: { accent_base_color }" width="18" height="18" viewBox="0 0 18 18" fill="none" xmlns="http://www.w3.org/2000/svg" slot="expanded-icon">
+<path d="M15.2222 1H2.77778C1.79594 1 1 1.79594 1 2.77778V15.2222C1 16.2041 1.79594 17 2.77778 17H15.2222C16.2041 17 17 16.2041 17 15.2222V2.77778C17 1.79594 16.2041 1 15.2222 1Z" stroke-linecap="round" stroke-linejoin="round"></path>
+<path d="M5.44446 9H12.5556" stroke-linecap="round" stroke-linejoin="round"></path>
+</svg>
+"""
+
+@functools.lru_cache(maxsize=None)
+def _get_menu(url: str, accent_base_color: str) -> str:
+    """Returns the HTML menu with the menu item of the given url marked as active"""
+    active = {
+        f"active_{ index }": _MENU_ITEM_ACTIVE if item_url==url else ""
+        for index, item_url in enumerate(_MENU_URLS)
+    }
+    return _MENU_TEMPLATE.substitute(
+        collapsed_icon=_get_collapsed_icon(accent_base_color),
+        expanded_icon=_get_expanded_icon(accent_base_color),
+        **active,
+    )
 
 class Configuration(param.Parameterized):
     theme = param.String()
@@ -87,52 +156,31 @@ class Configuration(param.Parameterized):
         self.header_color = _COLORS[color_index][1]
         self.header_background = self.accent_base_color
 
-        self.logo=_LOGOS[self.theme]
+        self.logo=get_url(_LOGOS[self.theme])
         self.ace_theme=_ACE_THEMES[self.theme]
 
     def _get_theme(self):
-        if pn.template.FastListTemplate().theme==pn.template.DarkTheme:
-            return "dark"
-        return "default"
+        return get_theme()
 
     def _get_random_color_index(self):
-        if not "color" in pn.state.cache:
-            pn.state.cache["color"]=-1
-        color = pn.state.cache["color"]+1
-        if color==len(_COLORS):
-            color=0
-        pn.state.cache["color"]=color
-        return color
+        # The rotation is shared by all workers if a shared cache backend is configured
+        return get_cache().increment("color", initial=-1) % len(_COLORS)
 
     @property
     def _collapsed_icon(self) -> str:
-        return f"""<svg style="stroke: { self.accent_base_color }" width="18" height="18" viewBox="0 0 18 18" fill="none" xmlns="http://www.w3.org/2000/svg" slot="collapsed-icon">
-<path d="M15.2222 1H2.77778C1.79594 1 1 1.79594 1 2.77778V15.2222C1 16.2041 1.79594 17 2.77778 17H15.2222C16.2041 17 17 16.2041 17 15.2222V2.77778C17 1.79594 16.2041 1 15.2222 1Z" stroke-linecap="round" stroke-linejoin="round"></path>
-<path d="M9 5.44446V12.5556" stroke-linecap="round" stroke-linejoin="round"></path>
-<path d="M5.44446 9H12.5556" stroke-linecap="round" stroke-linejoin="round"></path>
-</svg>"""
+        return _get_collapsed_icon(self.accent_base_color)
 
     @property
     def _expanded_icon(self) -> str:
-        return f"""<svg style="stroke: { self.accent_base_color }" width="18" height="18" viewBox="0 0 18 18" fill="none" xmlns="http://www.w3.org/2000/svg" slot="expanded-icon">
-<path d="M15.2222 1H2.77778C1.79594 1 1 1.79594 1 2.77778V15.2222C1 16.2041 1.79594 17 2.77778 17H15.2222C16.2041 17 17 16.2041 17 15.2222V2.77778C17 1.79594 16.2041 1 15.2222 1Z" stroke-linecap="round" stroke-linejoin="round"></path>
-<path d="M5.44446 9H12.5556" stroke-linecap="round" stroke-linejoin="round"></path>
-</svg>
-"""
+        return _get_expanded_icon(self.accent_base_color)
 
     @property
     def menu(self) -> str:
         """Returns a HTML Menu"""
-        test=f'<li><a href="{ self.url }">{ self.title }</a></li>'
-        return (
-            _MENU_TEXT
-            .replace("{ COLLAPSED_ICON }", self._collapsed_icon)
-            .replace("{ EXPANDED_ICON }", self._expanded_icon)
-            .replace(f'<li><a href="{ self.url }">{ self.title }</a></li>', f'<li class="menu-item-active"><a href="{ self.url }">{ self.title }</a></li>')
-        )
+        return _get_menu(self.url, self.accent_base_color)
 
     def get_logo_pane(self, **params):
-        return pn.pane.PNG(
+        return PNG(
             self.logo,
             link_url="https://panel.holoviz.org",
             embed=False,
@@ -0,0 +1,268 @@
+"""Local asset store for the logos, images, GIFs and datasets used by the pages
+
+The remote assets are mirrored into the git ignored `assets/mirror` folder at build time. The
+assets bundled with the repo in the other `assets` folders are used as they are
+
+```bash
+cd presentation
+python -m shared.assets
+```
+
+When served with `python -m shared.server` the assets are served from our own server under
+content hashed urls with immutable cache headers. If you use `panel serve` you can serve them via
+
+```bash
+AWESOME_PANEL_ASSETS_ROUTE=assets panel serve presentation/*.py --static-dirs assets=./assets
+```
+
+Otherwise, or if an asset has not been mirrored, the remote url is used. Behind a proxy set the
+`AWESOME_PANEL_TRUST_FORWARDED_HEADERS` environment variable to `1` to build the urls from its
+`X-Forwarded-Host` and `X-Forwarded-Proto` headers.
+
+Text assets like the datasets of the Vega and DeckGL examples are also stored precompressed as
+`.gz` and, if `brotli` is installed, `.br` files. `shared.server` serves these to browsers that
+accept them.
+
+Please use `get_pane` or the image panes of this module. They read the image data of local assets
+from disk instead of requesting it from our own server.
+"""
+import collections
+import functools
+import gzip
+import hashlib
+import os
+import pathlib
+import sys
+import urllib.parse
+import urllib.request
+
+import panel as pn
+
+ASSETS_PATH = pathlib.Path(__file__).parent.parent.parent / "assets"
+ASSETS_ROUTE_ENVIRONMENT_VARIABLE = "AWESOME_PANEL_ASSETS_ROUTE"
+# Only set this behind a proxy that sets the X-Forwarded-Host and X-Forwarded-Proto headers
+TRUST_FORWARDED_HEADERS = os.environ.get(
+    "AWESOME_PANEL_TRUST_FORWARDED_HEADERS", "0"
+).lower() in ("1", "true", "yes")
+MIRROR_FOLDER = "mirror"
+
+PRECOMPRESSED_SUFFIXES = (".csv", ".json", ".svg")
+
+Asset = collections.namedtuple("Asset", ["url", "path"])
+
+_GITHUB = "https://raw.githubusercontent.com/MarcSkovMadsen"
+_GITHUB_ASSETS = (
+    "https://github.com/MarcSkovMadsen/awesome-panel-assets/blob/"
+    "5535537e86ce49974794a12e289831204caa2774/images"
+)
+
+ASSETS = {
+    "panel-logo": Asset(
+        "https://panel.holoviz.org/_static/logo_stacked.png",
+        "mirror/panel-logo.png",
+    ),
+    "panel-logo-dark": Asset(
+        "https://raw.githubusercontent.com/holoviz/panel/98389a8dead125bcb7c60dc2c1564e112d89d3fa/doc/_static/logo_stacked_dark_theme.png",
+        "mirror/panel-logo-dark.png",
+    ),
+    "introduction-tour": Asset(
+        "https://github.com/MarcSkovMadsen/awesome-panel-introduction/blob/main/assets/videos/awesome-panel-introduction-tour.gif?raw=true",
+        "mirror/awesome-panel-introduction-tour.gif",
+    ),
+    "jupyter-logo": Asset(
+        f"{_GITHUB}/awesome-panel-introduction/2b74c2dd1f996a8c8c229870bdd2b14035007ecb/assets/logos/jupyter-logo.svg",
+        "logos/jupyter-logo.svg",
+    ),
+    "colab-logo": Asset(
+        "https://assets-global.website-files.com/5f1c75e63b2f950eb473d3e4/6074a3132bdc2e3119909dc1_6063796730397e49added231_google-colab-200x200.png",
+        "mirror/colab-logo.png",
+    ),
+    "vs-code-logo": Asset(
+        "https://images.prismic.io/launchdarkly/ZWQ2YzRhNTItYzg4Ny00NjA0LWI0NzItZWI5Mzg5ZDc3NDIy_visualstudio_code-card.png",
+        "mirror/vs-code-logo.png",
+    ),
+    "pycharm-logo": Asset(
+        f"{_GITHUB}/awesome-panel-introduction/master/assets/logos/pycharm-logo.svg",
+        "logos/pycharm-logo.svg",
+    ),
+    "works-in-vs-code": Asset(
+        f"{_GITHUB}/awesome-panel-introduction/main/assets/videos/works-in-vs-code-speedup.gif",
+        "videos/works-in-vs-code-speedup.gif",
+    ),
+    "works-in-jupyter": Asset(
+        f"{_GITHUB}/awesome-panel-introduction/main/assets/videos/works-in-jupyter-speedup.gif",
+        "videos/works-in-jupyter-speedup.gif",
+    ),
+    "works-in-colab": Asset(
+        f"{_GITHUB}/awesome-panel-introduction/main/assets/videos/works-in-colab-speedup.gif",
+        "mirror/works-in-colab-speedup.gif",
+    ),
+    "autoreload-video": Asset(
+        "https://blog.holoviz.org/images/autoreload.mp4",
+        "mirror/autoreload.mp4",
+    ),
+    "bokeh-logo": Asset(
+        f"{_GITHUB}/awesome-panel-assets/master/images/bokeh-logo.jpg",
+        "mirror/bokeh-logo.jpg",
+    ),
+    "voila-logo": Asset(
+        f"{_GITHUB}/awesome-panel-assets/master/images/voila-logo.png",
+        "mirror/voila-logo.png",
+    ),
+    "flask-logo": Asset(f"{_GITHUB_ASSETS}/flask-logo.png?raw=True", "mirror/flask-logo.png"),
+    "django-logo": Asset(
+        f"{_GITHUB_ASSETS}/django-logo-negative.png?raw=True", "mirror/django-logo-negative.png"
+    ),
+    "fast-api-logo": Asset(
+        f"{_GITHUB_ASSETS}/fast-api-logo.png?raw=True", "mirror/fast-api-logo.png"
+    ),
+    "barley-data": Asset(
+        "https://raw.githubusercontent.com/vega/vega/master/docs/data/barley.json",
+        "mirror/data/barley.json",
+    ),
+    "heatmap-data": Asset(
+        "https://raw.githubusercontent.com/uber-common/deck.gl-data/master/examples/3d-heatmap/heatmap-data.csv",
+        "mirror/data/heatmap-data.csv",
+    ),
+    "vancouver-blocks-data": Asset(
+        "https://raw.githubusercontent.com/uber-common/deck.gl-data/master/examples/geojson/vancouver-blocks.json",
+        "mirror/data/vancouver-blocks.json",
+    ),
+}
+
+
+# The local paths of the assets by the path and query of their urls. Not by the full urls. The host
+# is taken from the request headers. So the full urls are not bounded.
+_LOCAL_PATHS = {}
+
+
+def get_path(name: str) -> pathlib.Path:
+    """Returns the local path of the asset"""
+    return ASSETS_PATH / ASSETS[name].path
+
+
+@functools.lru_cache(maxsize=None)
+def get_hash(name: str) -> str:
+    """Returns the content hash of the local asset"""
+    return hashlib.sha256(get_path(name).read_bytes()).hexdigest()[:12]
+
+
+def _get_origin():
+    """Returns the protocol and host of the server. Or None if not in a server session
+
+    The `X-Forwarded-*` headers are only used if `TRUST_FORWARDED_HEADERS`.
+    """
+    doc = pn.state.curdoc
+    if not doc or not doc.session_context or not doc.session_context.request:
+        return None
+    request = doc.session_context.request
+    headers = request.headers
+    host = headers.get("Host", None)
+    protocol = getattr(request, "protocol", "http")
+    if TRUST_FORWARDED_HEADERS:
+        host = headers.get("X-Forwarded-Host", host)
+        protocol = headers.get("X-Forwarded-Proto", protocol)
+    if not host:
+        return None
+    return f"{protocol}://{host}"
+
+
+def _get_local_key(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.path}?{parts.query}"
+
+
+def get_url(name: str) -> str:
+    """Returns the url of the asset
+
+    The local, content hashed url if the asset is mirrored and served. Otherwise the remote url.
+    """
+    route = os.environ.get(ASSETS_ROUTE_ENVIRONMENT_VARIABLE, "")
+    if not route or not get_path(name).exists():
+        return ASSETS[name].url
+    origin = _get_origin()
+    if origin is None:
+        return ASSETS[name].url
+    local = f"{pn.state.base_url.rstrip('/')}/{route}/{ASSETS[name].path}?v={get_hash(name)}"
+    _LOCAL_PATHS[local] = get_path(name)
+    return origin + local
+
+
+@functools.lru_cache(maxsize=None)
+def _read(path: pathlib.Path) -> bytes:
+    return path.read_bytes()
+
+
+class _LocalData:
+    """Reads the data of local asset urls from disk instead of requesting it"""
+
+    priority = 0
+
+    def _data(self):
+        if isinstance(self.object, str):
+            path = _LOCAL_PATHS.get(_get_local_key(self.object), None)
+            if path is not None:
+                return _read(path)
+        return super()._data()
+
+
+class GIF(_LocalData, pn.pane.GIF):
+    """A GIF pane that reads local assets from disk"""
+
+
+class JPG(_LocalData, pn.pane.JPG):
+    """A JPG pane that reads local assets from disk"""
+
+
+class PNG(_LocalData, pn.pane.PNG):
+    """A PNG pane that reads local assets from disk"""
+
+
+class SVG(_LocalData, pn.pane.SVG):
+    """A SVG pane that reads local assets from disk"""
+
+
+_PANES = {".gif": GIF, ".jpg": JPG, ".png": PNG, ".svg": SVG}
+
+
+def get_pane(asset: str, **params):
+    """Returns an image pane of the asset"""
+    pane = _PANES[pathlib.Path(ASSETS[asset].path).suffix]
+    return pane(get_url(asset), embed=False, **params)
+
+
+def precompress(path: pathlib.Path):
+    """Writes the gzip and, if `brotli` is installed, brotli compressed versions of the file"""
+    data = path.read_bytes()
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return
+    path.with_name(path.name + ".br").write_bytes(brotli.compress(data))
+
+
+def is_mirrored(name: str) -> bool:
+    """Returns True if the asset is mirrored. False if it is bundled with the repo"""
+    return pathlib.PurePosixPath(ASSETS[name].path).parts[0] == MIRROR_FOLDER
+
+
+def mirror(force=False):
+    """Downloads the remote assets into the mirror folder
+
+    The assets bundled with the repo are never overwritten.
+    """
+    for name, asset in ASSETS.items():
+        path = get_path(name)
+        if not is_mirrored(name) or (path.exists() and not force):
+            continue
+        print(f"Mirroring {name} from {asset.url}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(asset.url, timeout=30) as response:
+            path.write_bytes(response.read())
+        if path.suffix in PRECOMPRESSED_SUFFIXES:
+            precompress(path)
+
+
+if __name__ == "__main__":
+    mirror(force="--force" in sys.argv)
@@ -0,0 +1,366 @@
+"""Cache backends shared by the pages and components
+
+Select the backend via the `AWESOME_PANEL_CACHE` environment variable
+
+- `memory` (default): An in-process cache backed by `pn.state.cache`.
+- `sqlite`: A file based cache shared by all processes on the machine.
+- `shared_memory`: A cache in a named shared memory segment shared by all processes on the machine.
+
+The `sqlite` and `shared_memory` backends are safe to use when serving with `--num-procs`.
+Their location can be configured via the `AWESOME_PANEL_CACHE_PATH` environment variable.
+"""
+import os
+import pathlib
+import pickle
+import sqlite3
+import struct
+import tempfile
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_MISSING = object()
+
+
+class CacheBackend:
+    """Base class of the cache backends"""
+
+    def get(self, key, default=None):
+        """Returns the value of the key or the default if it is not in the cache"""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """Sets the value of the key"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Removes the key from the cache if present"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes all keys from the cache"""
+        raise NotImplementedError
+
+    def increment(self, key, delta=1, initial=0) -> int:
+        """Atomically increments the value of the key and returns the new value
+
+        If the key is not in the cache its value is assumed to be `initial`.
+        """
+        raise NotImplementedError
+
+    def get_or_compute(self, key, func):
+        """Returns the value of the key. If missing it is computed by `func()` and stored.
+
+        The computation runs without holding any lock. If two workers compute the same key
+        concurrently, the first value stored wins and is returned to both.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self._set_default(key, func())
+
+    def _set_default(self, key, value):
+        raise NotImplementedError
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class MemoryCache(CacheBackend):
+    """An in-process cache. By default backed by `pn.state.cache`"""
+
+    def __init__(self, store=None):
+        if store is None:
+            import panel as pn
+
+            store = pn.state.cache
+        self._store = store
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        return self._store.get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            self._store[key] = value
+
+    def delete(self, key):
+        with self._lock:
+            self._store.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def increment(self, key, delta=1, initial=0) -> int:
+        with self._lock:
+            value = self._store.get(key, initial) + delta
+            self._store[key] = value
+            return value
+
+    def _set_default(self, key, value):
+        with self._lock:
+            return self._store.setdefault(key, value)
+
+
+class SQLiteCache(CacheBackend):
+    """A cache stored in a SQLite file. Shared by all processes using the same file
+
+    Args:
+        path (str): The path of the SQLite file.
+        max_bytes (int): Optional. When the pickled values exceed `max_bytes` in total, the
+            values stored first are evicted.
+    """
+
+    def __init__(self, path, max_bytes=None):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not be shared across threads or forked processes
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def _transaction(self):
+        return _SQLiteTransaction(self._connection)
+
+    def get(self, key, default=None):
+        row = self._connection.execute(
+            "SELECT value FROM cache WHERE key = ?", (_key(key),)
+        ).fetchone()
+        if row is None:
+            return default
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                (_key(key), pickle.dumps(value)),
+            )
+            self._evict(connection)
+
+    def delete(self, key):
+        self._connection.execute("DELETE FROM cache WHERE key = ?", (_key(key),))
+
+    def clear(self):
+        self._connection.execute("DELETE FROM cache")
+
+    def increment(self, key, delta=1, initial=0) -> int:
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT value FROM cache WHERE key = ?", (_key(key),)
+            ).fetchone()
+            value = (initial if row is None else pickle.loads(row[0])) + delta
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                (_key(key), pickle.dumps(value)),
+            )
+        return value
+
+    def _set_default(self, key, value):
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO cache (key, value) VALUES (?, ?)",
+                (_key(key), pickle.dumps(value)),
+            )
+            row = connection.execute(
+                "SELECT value FROM cache WHERE key = ?", (_key(key),)
+            ).fetchone()
+            self._evict(connection)
+        return pickle.loads(row[0])
+
+    def _evict(self, connection):
+        if self.max_bytes is None:
+            return
+        # Keeps the most recently stored values that fit into max_bytes
+        connection.execute(
+            """
+            DELETE FROM cache WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(LENGTH(value)) OVER (ORDER BY rowid DESC) AS total
+                    FROM cache
+                )
+                WHERE total > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+
+
+class _SQLiteTransaction:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __enter__(self):
+        # IMMEDIATE takes the write lock up front so read-modify-write is atomic across processes
+        self._connection.execute("BEGIN IMMEDIATE")
+        return self._connection
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._connection.execute("COMMIT")
+        else:
+            self._connection.execute("ROLLBACK")
+
+
+class SharedMemoryCache(CacheBackend):
+    """A cache stored in a named shared memory segment. Shared by all processes using the same name
+
+    The values are kept as a single pickled dictionary guarded by a file lock. So this backend is
+    meant for small values like counters and flags. Requires a posix system.
+    """
+
+    _HEADER = struct.Struct("Q")
+
+    def __init__(self, name="awesome_panel_cache", size=2**20, lock_path=None):
+        if fcntl is None:
+            raise RuntimeError("The shared_memory cache backend requires a posix system")
+        self.name = name
+        self.size = size
+        self._lock_path = lock_path or pathlib.Path(tempfile.gettempdir()) / f"{name}.lock"
+        self._thread_lock = threading.RLock()
+        with self._locked(fcntl.LOCK_EX):
+            try:
+                self._memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+                self._write({})
+            except FileExistsError:
+                self._memory = shared_memory.SharedMemory(name=name)
+        # The segment must outlive the process that created it. Use `unlink` to remove it.
+        resource_tracker.unregister(self._memory._name, "shared_memory")
+
+    def _locked(self, operation):
+        return _FileLock(self._lock_path, operation, self._thread_lock)
+
+    def _read(self) -> dict:
+        (length,) = self._HEADER.unpack_from(self._memory.buf, 0)
+        if not length:
+            return {}
+        start = self._HEADER.size
+        return pickle.loads(self._memory.buf[start : start + length])
+
+    def _write(self, values: dict):
+        data = pickle.dumps(values)
+        start = self._HEADER.size
+        if start + len(data) > self._memory.size:
+            raise ValueError(
+                f"The cache needs {start + len(data)} bytes. "
+                f"This exceeds the {self._memory.size} bytes of the shared memory segment"
+            )
+        self._memory.buf[start : start + len(data)] = data
+        self._HEADER.pack_into(self._memory.buf, 0, len(data))
+
+    def get(self, key, default=None):
+        with self._locked(fcntl.LOCK_SH):
+            return self._read().get(key, default)
+
+    def set(self, key, value):
+        with self._locked(fcntl.LOCK_EX):
+            values = self._read()
+            values[key] = value
+            self._write(values)
+
+    def delete(self, key):
+        with self._locked(fcntl.LOCK_EX):
+            values = self._read()
+            if values.pop(key, _MISSING) is not _MISSING:
+                self._write(values)
+
+    def clear(self):
+        with self._locked(fcntl.LOCK_EX):
+            self._write({})
+
+    def increment(self, key, delta=1, initial=0) -> int:
+        with self._locked(fcntl.LOCK_EX):
+            values = self._read()
+            value = values.get(key, initial) + delta
+            values[key] = value
+            self._write(values)
+        return value
+
+    def _set_default(self, key, value):
+        with self._locked(fcntl.LOCK_EX):
+            values = self._read()
+            if key in values:
+                return values[key]
+            values[key] = value
+            self._write(values)
+        return value
+
+    def unlink(self):
+        """Removes the shared memory segment"""
+        # `SharedMemory.unlink` unregisters the segment from the resource tracker
+        resource_tracker.register(self._memory._name, "shared_memory")
+        self._memory.close()
+        self._memory.unlink()
+
+
+class _FileLock:
+    def __init__(self, path, operation, thread_lock):
+        self._path = path
+        self._operation = operation
+        self._thread_lock = thread_lock
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._file = open(self._path, "a")
+        fcntl.flock(self._file, self._operation)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+        self._thread_lock.release()
+
+
+def _key(key) -> str:
+    return key if isinstance(key, str) else repr(key)
+
+
+_BACKENDS = {
+    "memory": lambda path: MemoryCache(),
+    "sqlite": lambda path: SQLiteCache(
+        path or pathlib.Path(tempfile.gettempdir()) / "awesome_panel_cache.sqlite"
+    ),
+    "shared_memory": lambda path: SharedMemoryCache(name=path or "awesome_panel_cache"),
+}
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """Returns the cache backend configured via the `AWESOME_PANEL_CACHE` environment variable"""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            backend = os.environ.get("AWESOME_PANEL_CACHE", "memory")
+            if backend not in _BACKENDS:
+                raise ValueError(
+                    f"The AWESOME_PANEL_CACHE backend '{backend}' is not supported. "
+                    f"Please use one of {list(_BACKENDS)}"
+                )
+            _CACHE = _BACKENDS[backend](os.environ.get("AWESOME_PANEL_CACHE_PATH", None))
+        return _CACHE
+
+
+def set_cache(cache: CacheBackend):
+    """Sets the cache backend returned by `get_cache`"""
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = cache
@@ -0,0 +1,115 @@
+"""Lifecycle management of the periodic work scheduled per session
+
+Scheduled work registers a cleanup via `on_destroyed`. It is called when the session is
+destroyed. So a tab left open during a talk does not keep a worker busy. See the
+`TypingScheduler` in `shared.typer`.
+
+The CPU time spent by the scheduled work is accounted per session via `record` as idle CPU, i.e.
+CPU spent while the user is not interacting. `python -m shared.server` reports it on the
+`/sessions` endpoint. The idle CPU of a session is also logged when it is destroyed.
+"""
+import collections
+import functools
+import logging
+import threading
+import time
+
+MAX_DESTROYED = 100
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStats:
+    """The periodic work and idle CPU of a session"""
+
+    __slots__ = ("id", "created", "destroyed", "calls", "idle_cpu_seconds", "cleanups")
+
+    def __init__(self, session_id):
+        self.id = session_id
+        self.created = time.time()
+        self.destroyed = None
+        self.calls = 0
+        self.idle_cpu_seconds = 0.0
+        self.cleanups = []
+
+    def to_dict(self) -> dict:
+        """Returns the stats as a JSON serializable dict"""
+        end = self.destroyed or time.time()
+        return {
+            "id": self.id,
+            "age_seconds": end - self.created,
+            "destroyed": self.destroyed is not None,
+            "calls": self.calls,
+            "idle_cpu_seconds": self.idle_cpu_seconds,
+        }
+
+
+class Lifecycle:
+    """Tracks the periodic work of the sessions of the process"""
+
+    def __init__(self, max_destroyed=MAX_DESTROYED):
+        self.sessions = {}
+        self.destroyed = collections.deque(maxlen=max_destroyed)
+        self._lock = threading.Lock()
+
+    def get_stats(self, doc):
+        """Returns the stats of the session of the document. Or None if not in a server session"""
+        if doc is None or doc.session_context is None:
+            return None
+        session_id = doc.session_context.id
+        with self._lock:
+            if session_id not in self.sessions:
+                self.sessions[session_id] = SessionStats(session_id)
+                doc.on_session_destroyed(self._session_destroyed)
+            return self.sessions[session_id]
+
+    def record(self, doc, cpu_seconds: float, calls=1):
+        """Accounts the CPU time spent by scheduled work as idle CPU of the session"""
+        stats = self.get_stats(doc)
+        if stats is not None:
+            stats.calls += calls
+            stats.idle_cpu_seconds += cpu_seconds
+
+    def on_destroyed(self, doc, cleanup):
+        """Calls `cleanup()` when the session of the document is destroyed"""
+        stats = self.get_stats(doc)
+        if stats is not None:
+            stats.cleanups.append(cleanup)
+
+    def _session_destroyed(self, session_context):
+        with self._lock:
+            stats = self.sessions.pop(session_context.id, None)
+        if stats is None:
+            return
+        stats.destroyed = time.time()
+        for cleanup in stats.cleanups:
+            try:
+                cleanup()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Cleanup of session %s failed", stats.id)
+        stats.cleanups = []
+        self.destroyed.append(stats)
+        logger.info(
+            "Session %s destroyed after %.0f seconds. Idle CPU %.3f seconds in %s calls",
+            stats.id,
+            stats.destroyed - stats.created,
+            stats.idle_cpu_seconds,
+            stats.calls,
+        )
+
+    def report(self) -> dict:
+        """Returns the stats of the active and the recently destroyed sessions"""
+        with self._lock:
+            active = [stats.to_dict() for stats in self.sessions.values()]
+        return {
+            "active": active,
+            "destroyed": [stats.to_dict() for stats in self.destroyed],
+            "idle_cpu_seconds": sum(session["idle_cpu_seconds"] for session in active),
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_lifecycle() -> Lifecycle:
+    """Returns the lifecycle manager shared by all sessions of the process"""
+    return Lifecycle()
+
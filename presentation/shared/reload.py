@@ -0,0 +1,110 @@
+"""Dependency aware module reloading for `panel serve --autoreload`
+
+Panel deletes every tracked module from `sys.modules` when any of them changes. This forces the
+component modules to re-run their heavy imports and reload their datasets on every edit.
+
+Here only the changed module and the tracked modules that import it, directly or indirectly,
+are deleted. All other modules, including the third party libraries and loaded datasets, stay
+resident.
+"""
+import ast
+import importlib.util
+import sys
+import types
+
+import panel as pn
+
+
+def _get_path(module_name):
+    module = sys.modules.get(module_name, None)
+    if not isinstance(module, types.ModuleType):
+        return None
+    path = getattr(module, "__file__", None)
+    if not path or not path.endswith(".py"):
+        return None
+    return path
+
+
+def _get_imported_names(module_name, path):
+    """Returns the names of the modules imported by the module, including candidate submodules"""
+    package = getattr(sys.modules[module_name], "__package__", None) or ""
+    with open(path, encoding="utf8") as file:
+        tree = ast.parse(file.read(), path)
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                parts = alias.name.split(".")
+                names.update(".".join(parts[: index + 1]) for index in range(len(parts)))
+        elif isinstance(node, ast.ImportFrom):
+            name = "." * node.level + (node.module or "")
+            try:
+                name = importlib.util.resolve_name(name, package)
+            except (ImportError, ValueError):
+                continue
+            names.add(name)
+            names.update(f"{name}.{alias.name}" for alias in node.names)
+    return names
+
+
+def get_dependents(modules):
+    """Returns a dictionary mapping each module to the set of modules that import it directly
+
+    Only the given modules are considered.
+    """
+    modules = set(modules)
+    dependents = {module: set() for module in modules}
+    for module in modules:
+        path = _get_path(module)
+        if path is None:
+            continue
+        try:
+            imported = _get_imported_names(module, path)
+        except (OSError, SyntaxError):
+            continue
+        for name in imported & modules:
+            if name != module:
+                dependents[name].add(module)
+    return dependents
+
+
+def get_invalidated(module, modules):
+    """Returns the module and the modules that import it directly or indirectly"""
+    dependents = get_dependents(modules)
+    invalidated = set()
+    pending = [module]
+    while pending:
+        module = pending.pop()
+        if module in invalidated:
+            continue
+        invalidated.add(module)
+        pending.extend(dependents.get(module, ()))
+    return invalidated
+
+
+def _unload(module_name):
+    sys.modules.pop(module_name, None)
+    # Otherwise `from package import module` would return the stale module
+    parent_name, _, child_name = module_name.rpartition(".")
+    parent = sys.modules.get(parent_name, None)
+    if parent is not None and child_name in getattr(parent, "__dict__", {}):
+        delattr(parent, child_name)
+
+
+def _reload(module=None):
+    if module is not None:
+        for module_name in get_invalidated(module, pn.io.reload._modules):
+            _unload(module_name)
+    for cb in pn.io.reload._callbacks.values():
+        cb.stop()
+    pn.io.reload._callbacks.clear()
+    if pn.state.location:
+        pn.state.location.reload = True
+    for loc in pn.state._locations.values():
+        loc.reload = True
+
+
+def install():
+    """Replaces the blanket module invalidation of Panel with the dependency aware one"""
+    pn.io.reload._reload = _reload
@@ -0,0 +1,153 @@
+"""Serves the presentation together with our own routes
+
+```bash
+cd presentation
+python -m shared.server --port 5006 --num-procs 4
+```
+
+Compared to `panel serve presentation/*.py` this also
+
+- serves the local asset store under content hashed urls with immutable cache headers. The
+precompressed versions of the text assets and datasets are served if the browser accepts them.
+- warms up the components in each worker process at start. The `/ready` endpoint responds with
+status 503 until the worker is warm and reports the warmup time per component.
+- reports the idle CPU spent by the periodic work of the active and recently destroyed sessions of
+the worker on the `/sessions` endpoint.
+"""
+import argparse
+import json
+import mimetypes
+import os
+import pathlib
+
+import panel as pn
+from tornado.web import RequestHandler, StaticFileHandler
+
+from . import ACCENT_BASE_COLORS, assets
+from .lifecycle import get_lifecycle
+
+PRESENTATION_PATH = pathlib.Path(__file__).parent.parent
+ASSETS_ROUTE = "assets"
+READY_ROUTE = "ready"
+SESSIONS_ROUTE = "sessions"
+
+
+class ImmutableStaticFileHandler(StaticFileHandler):
+    """Serves static files. Content hashed (versioned) urls are cached forever"""
+
+    def set_extra_headers(self, path):
+        if self.get_query_argument("v", None):
+            self.set_header("Cache-Control", "public, max-age=31536000, immutable")
+
+
+class PrecompressedStaticFileHandler(ImmutableStaticFileHandler):
+    """Serves the precompressed `.br` or `.gz` version of a static file if it is accepted
+
+    The ETag and range requests refer to the file served. Like for any other static file.
+    """
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    def validate_absolute_path(self, root, absolute_path):
+        absolute_path = super().validate_absolute_path(root, absolute_path)
+        self.uncompressed_path = absolute_path  # pylint: disable=attribute-defined-outside-init
+        self.encoding = None  # pylint: disable=attribute-defined-outside-init
+        if absolute_path is None:
+            return None
+        header = self.request.headers.get("Accept-Encoding", "")
+        accepted = {value.split(";")[0].strip() for value in header.split(",")}
+        for encoding, suffix in self.ENCODINGS:
+            if encoding in accepted and os.path.isfile(absolute_path + suffix):
+                self.encoding = encoding  # pylint: disable=attribute-defined-outside-init
+                return super().validate_absolute_path(root, absolute_path + suffix)
+        return absolute_path
+
+    def get_content_type(self):
+        mime_type, _ = mimetypes.guess_type(self.uncompressed_path)
+        return mime_type or "application/octet-stream"
+
+    def set_extra_headers(self, path):
+        super().set_extra_headers(path)
+        self.set_header("Vary", "Accept-Encoding")
+        if self.encoding:
+            self.set_header("Content-Encoding", self.encoding)
+
+
+class ReadinessHandler(RequestHandler):
+    """Reports the warmup of the worker. Responds with status 503 until it is warm"""
+
+    def initialize(self, warmup):
+        self.warmup = warmup  # pylint: disable=attribute-defined-outside-init
+
+    def get(self):
+        self.set_status(200 if self.warmup.ready else 503)
+        self.set_header("Content-Type", "application/json")
+        self.set_header("Cache-Control", "no-store")
+        self.write(json.dumps(self.warmup.report()))
+
+
+class SessionsHandler(RequestHandler):
+    """Reports the periodic work and idle CPU of the sessions of the worker"""
+
+    def get(self):
+        self.set_header("Content-Type", "application/json")
+        self.set_header("Cache-Control", "no-store")
+        self.write(json.dumps(get_lifecycle().report()))
+
+
+def get_pages():
+    """Returns a dictionary of the pages to serve"""
+    return {path.stem: str(path) for path in sorted(PRESENTATION_PATH.glob("*.py"))}
+
+
+def get_routes(warmup=None):
+    """Returns the extra routes to serve"""
+    routes = [
+        (
+            f"/{ASSETS_ROUTE}/(.*)",
+            PrecompressedStaticFileHandler,
+            {"path": str(assets.ASSETS_PATH)},
+        ),
+        (f"/{SESSIONS_ROUTE}", SessionsHandler),
+    ]
+    if warmup is not None:
+        routes.append((f"/{READY_ROUTE}", ReadinessHandler, {"warmup": warmup}))
+    return routes
+
+
+def serve(port=5006, num_procs=1, warmup=True, **kwargs):
+    """Serves the presentation"""
+    from components.warmup import Warmup
+
+    os.environ[assets.ASSETS_ROUTE_ENVIRONMENT_VARIABLE] = ASSETS_ROUTE
+    warmup = Warmup(accent_base_colors=ACCENT_BASE_COLORS) if warmup else None
+    # The worker processes are forked when the server is created. So the warmup threads are
+    # started afterwards, in each worker.
+    server = pn.serve(
+        get_pages(),
+        port=port,
+        num_procs=num_procs,
+        extra_patterns=get_routes(warmup),
+        show=False,
+        start=False,
+        **kwargs,
+    )
+    if warmup is not None:
+        warmup.start()
+    server.start()
+    server.io_loop.start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serves the presentation")
+    parser.add_argument("--port", type=int, default=5006)
+    parser.add_argument("--num-procs", type=int, default=1)
+    parser.add_argument("--allow-websocket-origin", action="append", default=None)
+    parser.add_argument("--no-warmup", action="store_true", help="Do not warm up the components")
+    args = parser.parse_args()
+    serve(
+        port=args.port,
+        num_procs=args.num_procs,
+        warmup=not args.no_warmup,
+        websocket_origin=args.allow_websocket_origin,
+    )
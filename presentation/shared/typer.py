@@ -0,0 +1,277 @@
+"""Animates the typing of a script and the command to run it
+
+The script and command are sent to the browser once. The typing is animated by the browser in an
+Ace editor. So a typer session costs the server no CPU and no bandwidth after the page has loaded.
+
+With `mode="delta"` the animation is clocked by the server instead. Each tick only sends the
+number of characters typed so far. The delta mode animations of all sessions of the process are
+advanced by a single `TypingScheduler` in one batched tick. So the timer overhead does not grow
+with the number of sessions. The delta mode is opt-in. Set the `AWESOME_PANEL_TYPER_MODE`
+environment variable to `delta` to use it on the typer pages.
+"""
+import asyncio
+import collections
+import functools
+import os
+import time
+
+import panel as pn
+import param
+from panel.models.ace import AcePlot
+from tornado.ioloop import PeriodicCallback
+
+from .lifecycle import get_lifecycle
+
+SVG = """
+<svg xmlns="http://www.w3.org/2000/svg" width="54" height="14" viewBox="0 0 54 14"><g fill="none" fill-rule="evenodd" transform="translate(1 1)"><circle cx="6" cy="6" r="6" fill="#FF5F56" stroke="#E0443E" stroke-width=".5"></circle><circle cx="26" cy="6" r="6" fill="#FFBD2E" stroke="#DEA123" stroke-width=".5"></circle><circle cx="46" cy="6" r="6" fill="#27C93F" stroke="#1AAB29" stroke-width=".5"></circle></g></svg>
+"""
+TERMINAL_BACKGROUND = "#25282c"
+PERIOD = 20
+MODE = os.environ.get("AWESOME_PANEL_TYPER_MODE", "client")
+
+CSS = """
+body {{
+    background: {accent_base_color};
+    margin: 0px;
+    min-height: 100vh;
+}}
+"""
+
+
+class _Typing:
+    """The state of a delta mode animation in a session"""
+
+    __slots__ = ("doc", "model", "position", "value_length", "end", "chars_per_tick")
+
+    def __init__(self, doc, model, value_length, command_length, chars_per_tick):
+        self.doc = doc
+        self.model = model
+        self.position = 0
+        self.value_length = value_length
+        self.end = value_length + command_length
+        self.chars_per_tick = chars_per_tick
+
+    def advance(self):
+        if self.position < self.value_length:
+            self.position = min(self.position + self.chars_per_tick, self.value_length)
+        else:
+            self.position += 1
+
+
+async def _update(typings, doc):
+    start = time.thread_time()
+    for typing in typings:
+        typing.model.data.position = typing.position
+    get_lifecycle().record(doc, time.thread_time() - start)
+
+
+class TypingScheduler:
+    """Advances the delta mode animations of all sessions in a single periodic callback
+
+    The callback only runs while there are animations typing. An animation is removed when it has
+    finished typing or its session is destroyed. The CPU spent per session is accounted as idle
+    CPU. See `shared.lifecycle`.
+    """
+
+    def __init__(self, period=PERIOD):
+        self.period = period
+        self.typings = {}
+        self._callback = None
+
+    def add(self, doc, model, value: str, command: str, chars_per_tick: int):
+        """Starts typing the value and command into the Bokeh model of a TypingAnimation"""
+        typing = _Typing(doc, model, len(value), len(command), chars_per_tick)
+        self.typings[model.ref["id"]] = typing
+        get_lifecycle().on_destroyed(doc, functools.partial(self.remove, model))
+        if self._callback is None:
+            self._callback = PeriodicCallback(self.tick, self.period)
+            self._callback.start()
+
+    def remove(self, model):
+        """Stops typing into the Bokeh model"""
+        self.typings.pop(model.ref["id"], None)
+
+    async def tick(self):
+        """Advances all animations and sends the new positions to their sessions"""
+        typings_by_doc = collections.defaultdict(list)
+        for key, typing in list(self.typings.items()):
+            typing.advance()
+            typings_by_doc[typing.doc].append(typing)
+            if typing.position >= typing.end:
+                del self.typings[key]
+        if not self.typings and self._callback is not None:
+            self._callback.stop()
+            self._callback = None
+
+        updates = []
+        for doc, typings in typings_by_doc.items():
+            context = doc.session_context
+            if context is not None and not context.destroyed:
+                updates.append(context.with_locked_document(functools.partial(_update, typings)))
+        await asyncio.gather(*updates, return_exceptions=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_scheduler() -> TypingScheduler:
+    """Returns the scheduler shared by all sessions of the process"""
+    return TypingScheduler()
+
+
+class TypingAnimation(pn.reactive.ReactiveHTML):
+    """An Ace editor typing the `value` followed by a terminal typing the `command`"""
+
+    value = param.String()
+    command = param.String()
+    language = param.String(default="python")
+    theme = param.String(default="tomorrow_night")
+    mode = param.Selector(default="client", objects=["client", "delta"])
+    period = param.Integer(
+        default=PERIOD, doc="The milliseconds between two ticks of the client mode"
+    )
+    chars_per_tick = param.Integer(default=5)
+    position = param.Integer(
+        default=0, doc="The characters typed so far. Sent by the scheduler in the delta mode"
+    )
+    editor_height = param.Integer(default=650)
+
+    __javascript__ = AcePlot.__javascript_raw__
+
+    _template = f"""
+<div id="editor" style="width: 100%"></div>
+<pre id="terminal" style="margin: 20px 0 0 0; padding: 10px 25px; height: 55px; overflow: hidden;
+white-space: pre-wrap; background: {TERMINAL_BACKGROUND}; color: white; font-size: 14px"></pre>
+"""
+
+    _scripts = {
+        "render": """
+editor.style.height = data.editor_height + "px"
+state.editor = ace.edit(editor)
+state.editor.setTheme("ace/theme/" + data.theme)
+state.editor.session.setMode("ace/mode/" + data.language)
+state.editor.setReadOnly(true)
+state.editor.setShowPrintMargin(false)
+self.start()
+""",
+        "start": """
+clearInterval(state.timer)
+state.editor.setValue("", -1)
+state.shown = 0
+state.position = data.position
+self.show()
+if (data.mode !== "client") {
+  return
+}
+const end = data.value.length + data.command.length
+state.timer = setInterval(() => {
+  if (state.position < data.value.length) {
+    state.position = Math.min(state.position + data.chars_per_tick, data.value.length)
+  } else {
+    state.position += 1
+  }
+  self.show()
+  if (state.position >= end) {
+    clearInterval(state.timer)
+  }
+}, data.period)
+""",
+        "show": """
+const end = Math.min(state.position, data.value.length)
+if (end > state.shown) {
+  const position = {row: Number.MAX_VALUE, column: Number.MAX_VALUE}
+  state.editor.session.insert(position, data.value.slice(state.shown, end))
+  state.shown = end
+}
+const typed = Math.max(state.position - data.value.length, 0)
+terminal.textContent = "$ " + data.command.slice(0, typed)
+""",
+        "position": """
+state.position = data.position
+self.show()
+""",
+        "value": "self.start()",
+        "command": "self.start()",
+        "mode": "self.start()",
+        "remove": "clearInterval(state.timer)",
+    }
+
+    def _get_model(self, doc, root=None, parent=None, comm=None):
+        model = super()._get_model(doc, root, parent, comm)
+        if self.mode == "delta" and doc.session_context is not None:
+            pn.state.onload(
+                functools.partial(
+                    get_scheduler().add,
+                    doc,
+                    model,
+                    self.value,
+                    self.command,
+                    self.chars_per_tick,
+                )
+            )
+        return model
+
+    def _cleanup(self, root):
+        model, _ = self._models.get(root.ref["id"], (None, None))
+        if model is not None:
+            get_scheduler().remove(model)
+        super()._cleanup(root)
+
+
+class CodeTyper(pn.viewable.Viewer):
+    """A terminal window typing a script and the command to serve it"""
+
+    value = param.String()
+    command = param.String()
+    title = param.String()
+    filename = param.String()
+    language = param.String(default="python")
+    theme = param.String(default="tomorrow_night")
+    mode = param.Selector(default=MODE, objects=["client", "delta"])
+    period = param.Integer(default=PERIOD)
+    height = param.Integer(650)
+    accent_base_color = param.String("#6082A2")
+
+    def __init__(self, **params):
+        super().__init__(**params)
+
+        self._animation = TypingAnimation(
+            value=self.value,
+            command=self.command,
+            language=self.language,
+            theme=self.theme,
+            mode=self.mode,
+            period=self.period,
+            editor_height=self.height,
+            height=self.height + 75,
+            margin=0,
+        )
+        style = {"color": "white"}
+        self._layout = pn.Column(
+            pn.Column(
+                pn.pane.Markdown(f"# {self.title}", style=style),
+                pn.Row(
+                    pn.pane.SVG(SVG, margin=7),
+                    pn.Spacer(),
+                    background=TERMINAL_BACKGROUND,
+                    height=30,
+                    margin=0,
+                ),
+                pn.pane.Markdown(
+                    f"&nbsp; &nbsp; `{self.filename}`",
+                    background=TERMINAL_BACKGROUND,
+                    margin=0,
+                    style=style,
+                ),
+                self._animation,
+                margin=(50, 150),
+            ),
+            pn.pane.HTML(
+                "<style>" + CSS.format(accent_base_color=self.accent_base_color) + "</style>",
+                width=0,
+                height=0,
+                margin=0,
+            ),
+            background=self.accent_base_color,
+        )
+
+    def __panel__(self):
+        return self._layout
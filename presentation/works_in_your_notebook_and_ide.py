@@ -5,7 +5,10 @@ from matplotlib.figure import Figure
 from matplotlib import cm
 from matplotlib.backends.backend_agg import FigureCanvas  # not needed for mpl >= 3.1
 import matplotlib.pyplot as plt
+from components import render
+from components.base import memoize
 from shared import Configuration
+from shared.assets import get_pane, get_url
 
 config = Configuration(title="Works in your Notebook and IDE", url="works_in_your_notebook_and_ide", random=True)
 pn.extension("ace", sizing_mode="stretch_width")
@@ -20,30 +23,26 @@ text = """# Works in your Notebook and IDE
 # Define the Image Component
 
 image_component = pn.layout.FlexBox(
-    pn.pane.SVG(
-        "https://raw.githubusercontent.com/MarcSkovMadsen/awesome-panel-introduction/2b74c2dd1f996a8c8c229870bdd2b14035007ecb/assets/logos/jupyter-logo.svg",
-        embed=False,
+    get_pane(
+        "jupyter-logo",
         height=100,
         margin=(0,0,0,50),
         sizing_mode="fixed",
     ),
-    pn.pane.PNG(
-        "https://assets-global.website-files.com/5f1c75e63b2f950eb473d3e4/6074a3132bdc2e3119909dc1_6063796730397e49added231_google-colab-200x200.png",
-        embed=False,
+    get_pane(
+        "colab-logo",
         height=100,
         margin=(0,0,0,50),
         sizing_mode="fixed",
     ),
-    pn.pane.PNG(
-        "https://images.prismic.io/launchdarkly/ZWQ2YzRhNTItYzg4Ny00NjA0LWI0NzItZWI5Mzg5ZDc3NDIy_visualstudio_code-card.png",
-        embed=False,
+    get_pane(
+        "vs-code-logo",
         height=100,
         margin=(0,0,0,50),
         sizing_mode="fixed",
     ),
-    pn.pane.SVG(
-        "https://raw.githubusercontent.com/MarcSkovMadsen/awesome-panel-introduction/master/assets/logos/pycharm-logo.svg",
-        embed=False,
+    get_pane(
+        "pycharm-logo",
         height=100,
         margin=(0,0,0,50),
         sizing_mode="fixed",
@@ -62,14 +61,19 @@ COLOR_MAPS = {
 }
 
 
+@memoize
+def get_field():
+    Y, X = np.mgrid[-3:3:100j, -3:3:100j]
+    U = -1 - X ** 2 + Y
+    V = 1 + X - Y ** 2
+    return X, Y, U, V
+
+
 def get_plot(cmap="Autumn", theme="default"):
     plt.style.use("default")
     if theme == "dark":
         plt.style.use("dark_background")
-    Y, X = np.mgrid[-3:3:100j, -3:3:100j]
-    U = -1 - X ** 2 + Y
-    V = 1 + X - Y ** 2
-    speed = np.sqrt(U * U + V * V)
+    X, Y, U, V = get_field()
 
     fig0 = Figure(figsize=(15, 5))
     ax0 = fig0.subplots()
@@ -81,12 +85,21 @@ def get_plot(cmap="Autumn", theme="default"):
     return fig0
 
 
+def get_image(cmap="Autumn", theme="default"):
+    return render.get_pane(
+        ("works_in_your_notebook_and_ide", cmap, theme),
+        lambda: get_plot(cmap=cmap, theme=theme),
+        size=(15, 5),
+        sizing_mode="stretch_both",
+    )
+
+
 select = pn.widgets.Select(name="Color Map", options=list(COLOR_MAPS.keys()))
-get_plot = pn.bind(get_plot, cmap=select, theme=config.theme)
+get_image = pn.bind(get_image, cmap=select, theme=config.theme)
 
 component = pn.Column(
     select,
-    pn.panel(get_plot, sizing_mode="stretch_both", loading_indicator=True),
+    pn.panel(get_image, sizing_mode="stretch_both", loading_indicator=True),
     sizing_mode="stretch_both",
     name="Example",
     margin=(20, 5, 10, 5),
@@ -158,34 +171,31 @@ code_component = pn.Column(
 
 # Gifs
 
-vs_code = pn.pane.PNG(
-    "https://raw.githubusercontent.com/MarcSkovMadsen/awesome-panel-introduction/main/assets/videos/works-in-vs-code-speedup.gif",
-    embed=False,
+vs_code = get_pane(
+    "works-in-vs-code",
     height=400, width=781,
     sizing_mode="scale_height",
     align="center",
     name="VS Code .ipynb",
 )
 
-vs_code2 = pn.pane.HTML("""
+vs_code2 = pn.pane.HTML(f"""
 <div style="margin: 0 auto; height: 400px">
-<video controls="" src="https://blog.holoviz.org/images/autoreload.mp4" height="400"></video>
+<video controls="" src="{ get_url("autoreload-video") }" height="400"></video>
 </div>
 """, align="center", name="VS Code .py"
 )
 
-jupyter = pn.pane.PNG(
-    "https://raw.githubusercontent.com/MarcSkovMadsen/awesome-panel-introduction/main/assets/videos/works-in-jupyter-speedup.gif",
-    embed=False,
+jupyter = get_pane(
+    "works-in-jupyter",
     height=400, width=733,
     sizing_mode="scale_height",
     align="center",
     name="Jupyter",
 )
 
-colab = pn.pane.PNG(
-    "https://raw.githubusercontent.com/MarcSkovMadsen/awesome-panel-introduction/main/assets/videos/works-in-colab-speedup.gif",
-    embed=False,
+colab = get_pane(
+    "works-in-colab",
     height=400, width=504,
     sizing_mode="scale_height",
     align="center",
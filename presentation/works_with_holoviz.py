@@ -15,7 +15,7 @@ config = Configuration(
     random=True,
 )
 
-components = {k: v() for k,v in holoviz.ALL.items()}
+components = holoviz.ALL
 
 description = """
 # Works with HoloViz ❤️
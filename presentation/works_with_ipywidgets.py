@@ -30,7 +30,7 @@ DARK_CSS = """
 }}
 """
 
-components = {k: v() for k,v in ipywidgets.ALL.items()}
+components = ipywidgets.ALL
 
 description = """
 # Works with IPyWidgets ❤️
@@ -15,7 +15,7 @@ config = Configuration(
     random=True,
 )
 
-components = {k: v() for k,v in pyviz.ALL.items()}
+components = pyviz.ALL
 
 description = """
 # Works with Pythons Viz ❤️
@@ -1,8 +1,9 @@
 import panel as pn
 
 from shared import Configuration
+from shared.assets import get_pane
 
-config = Configuration(title="Works in your Notebook and IDE", url="works_in_your_notebook_and_ide", random=True)
+config = Configuration(title="Works with your Server", url="works_with_your_server", random=True)
 pn.extension(sizing_mode="stretch_width")
 
 # Define the Text
@@ -15,50 +16,44 @@ text = """# Works with your Favorite Server
 # Define the Image Component
 
 image_component = pn.layout.FlexBox(
-    pn.pane.PNG(
-        "https://panel.holoviz.org/_static/logo_stacked.png",
+    get_pane(
+        "panel-logo",
         link_url="https://panel.holoviz.org/user_guide/Server_Deployment.html",
-        embed=False,
         height=115,
         margin=25,
         sizing_mode="fixed",
     ),
-    pn.pane.JPG(
-        "https://raw.githubusercontent.com/MarcSkovMadsen/awesome-panel-assets/master/images/bokeh-logo.jpg",
+    get_pane(
+        "bokeh-logo",
         link_url="https://docs.bokeh.org/en/latest/docs/user_guide/server.html",
-        embed=False,
         height=115,
         margin=25,
         sizing_mode="fixed",
     ),
-    pn.pane.PNG(
-        "https://raw.githubusercontent.com/MarcSkovMadsen/awesome-panel-assets/master/images/voila-logo.png",
+    get_pane(
+        "voila-logo",
         link_url="https://panel.holoviz.org/FAQ.html?highlight=voila",
-        embed=False,
         height=115,
         margin=25,
         sizing_mode="fixed",
     ),
-    pn.pane.PNG(
-        "https://github.com/MarcSkovMadsen/awesome-panel-assets/blob/5535537e86ce49974794a12e289831204caa2774/images/flask-logo.png?raw=True",
+    get_pane(
+        "flask-logo",
         link_url="https://discourse.holoviz.org/t/panel-server-embedded-in-flask-gunicorn/978",
-        embed=False,
         height=115,
         margin=25,
         sizing_mode="fixed",
     ),
-    pn.pane.PNG(
-        "https://github.com/MarcSkovMadsen/awesome-panel-assets/blob/5535537e86ce49974794a12e289831204caa2774/images/django-logo-negative.png?raw=True",
+    get_pane(
+        "django-logo",
         link_url="https://panel.holoviz.org/user_guide/Django_Apps.html",
-        embed=False,
         height=115,
         margin=25,
         sizing_mode="fixed",
     ),
-    pn.pane.PNG(
-        "https://github.com/MarcSkovMadsen/awesome-panel-assets/blob/5535537e86ce49974794a12e289831204caa2774/images/fast-api-logo.png?raw=True",
+    get_pane(
+        "fast-api-logo",
         link_url="https://hackmd.io/ileoi_9YT6eEm27hbxTzmA?view",
-        embed=False,
         height=115,
         margin=25,
         sizing_mode="fixed",
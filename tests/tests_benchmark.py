@@ -0,0 +1,32 @@
+from presentation.components.benchmark import compare, main
+
+
+def test_compare():
+    baseline = {
+        "results": {
+            "pyviz.BOKEH": {
+                "import_seconds": 0.5,
+                "themes": {"default": {"build_seconds": 0.1, "models": 30, "json_bytes": 1000}},
+            },
+            "pyviz.VEGA": {"error": "ValueError"},
+        }
+    }
+    results = {
+        "results": {
+            "pyviz.BOKEH": {
+                "import_seconds": 0.6,
+                "themes": {"default": {"build_seconds": 0.1, "models": 40, "json_bytes": 1000}},
+            },
+            "pyviz.VEGA": {"error": "ValueError"},
+        }
+    }
+    assert compare(results, baseline) == ["pyviz.BOKEH/default/models: 40 > 30 (baseline)"]
+
+    results["results"]["pyviz.BOKEH"] = {"error": "Traceback\nValueError: Failed"}
+    assert compare(results, baseline) == ["pyviz.BOKEH failed: ValueError: Failed"]
+
+
+def test_missing_baseline(tmp_path):
+    baseline, results = tmp_path / "baseline.json", tmp_path / "results.json"
+    assert main(["--baseline", str(baseline), "--results", str(results)]) == 1
+    assert not results.exists()
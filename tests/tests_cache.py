@@ -0,0 +1,29 @@
+from presentation.shared.cache import MemoryCache, SQLiteCache
+
+
+def test_memory_cache():
+    cache = MemoryCache({})
+    assert cache.increment("color", initial=-1) == 0
+    assert cache.increment("color", initial=-1) == 1
+    assert cache.get_or_compute("value", lambda: 1) == 1
+    assert cache.get_or_compute("value", lambda: 2) == 1
+
+
+def test_sqlite_cache(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    assert cache.increment("color") == 1
+    assert SQLiteCache(tmp_path / "cache.sqlite").increment("color") == 2
+    assert cache.get_or_compute(("value", 1), lambda: [1]) == [1]
+    assert cache.get_or_compute(("value", 1), lambda: [2]) == [1]
+    cache.delete(("value", 1))
+    assert ("value", 1) not in cache
+
+
+def test_sqlite_cache_max_bytes(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", max_bytes=2500)
+    for key in range(4):
+        cache.set(key, bytes(1000))
+    assert 0 not in cache and 1 not in cache
+    assert cache.get_or_compute(3, lambda: b"") == bytes(1000)
+    assert cache.get_or_compute(4, lambda: bytes(1000)) == bytes(1000)
+    assert 2 not in cache and 3 in cache
@@ -1,7 +1,44 @@
-from presentation.components import Altair
+import numpy as np
+import panel as pn
+import pytest
+
+from presentation.components import (
+    cross_filter,
+    datasets,
+    explorer,
+    holoviz,
+    indicators,
+    ipywidgets,
+    pyviz,
+)
+from presentation.components.base import ComponentBase, memoize
+
+
+def _get_components(module):
+    """Returns the component classes of the registry of the module by name
+
+    The registry is not used to look them up. It would import the libraries and fetch the data of
+    the components. The code only needs the source of the classes.
+    """
+    classes = {
+        value.__name__.upper(): value
+        for value in vars(module).values()
+        if isinstance(value, type)
+        and issubclass(value, ComponentBase)
+        and value.__module__ == module.__name__
+    }
+    return {name: classes[name.upper()] for name in module.ALL}
+
+
+COMPONENTS = {
+    name: component
+    for module in [pyviz, holoviz, ipywidgets]
+    for name, component in _get_components(module).items()
+}
+COMPONENTS["TREND"] = indicators.Trend
 
 def test_altair():
-    assert Altair().code()=="""\
+    assert pyviz.Altair().code()=="""\
 import altair as alt
 import panel as pn
 
@@ -9,6 +46,8 @@ from vega_datasets import data
 
 pn.extension("vega", sizing_mode="stretch_width")
 
+cars = data.cars()
+
 accent_base_color = "blue"
 template = pn.template.FastListTemplate(
     site="Awesome Panel",
@@ -27,7 +66,7 @@ def get_plot(theme="default", accent_base_color="blue"):
         alt.themes.enable("default")
 
     return (
-        alt.Chart(data.cars())
+        alt.Chart(cars)
         .mark_circle(size=60)
         .encode(
             x="Horsepower",
@@ -45,4 +84,99 @@ def get_plot(theme="default", accent_base_color="blue"):
 plot = get_plot(theme=theme, accent_base_color=accent_base_color)
 component = pn.pane.Vega(plot, height=500, sizing_mode="stretch_both")
 template.main.append(component)
-template.servable()"""
\ No newline at end of file
+template.servable()"""
+
+
+@pytest.mark.parametrize("name", list(COMPONENTS))
+def test_code(name):
+    code = COMPONENTS[name]().code(accent_base_color="red")
+    compile(code, name, "exec")
+    assert 'accent_base_color = "red"' in code
+    assert "return component" not in code
+    assert "def example" not in code
+    assert code.endswith("component)\ntemplate.servable()")
+
+
+def test_code_keeps_leading_comments():
+    code = pyviz.DeckGL().code()
+    assert "# https://account.mapbox.com/access-tokens/\nMAPBOX_KEY" in code
+
+
+def test_estimate_size():
+    from bokeh.plotting import figure
+
+    plot = figure()
+    plot.line(np.arange(10_000.0), np.arange(10_000.0))
+    assert explorer.estimate_size(pn.pane.Bokeh(plot)) >= 160_000
+
+
+def test_schedule_unlocked():
+    from bokeh.document import Document
+
+    async def show(generation):
+        pass
+
+    callback = explorer._schedule_unlocked(Document(), show, 1)
+    assert callback.callback.nolock
+
+
+def test_memoize():
+    calls = []
+
+    def get_data(n=1):
+        calls.append(n)
+        return [n]
+
+    for _ in range(2):
+        memoized = memoize(max_size=1)(get_data)
+        assert memoized(1) == [1]
+    assert calls == [1]
+    assert memoized(2) == [2]
+    assert memoized(1) == [1]
+    assert calls == [1, 2, 1]
+
+
+def test_air_attrs(tmp_path, monkeypatch):
+    import xarray as xr
+
+    attrs = {"actual_range": np.array([185.16, 322.1]), "precision": np.int16(2), "units": "degK"}
+    data = xr.DataArray(
+        np.zeros((2, 1, 1), dtype=np.float32),
+        coords={"time": np.arange(2), "lat": [75.0], "lon": [200.0]},
+        dims=("time", "lat", "lon"),
+        attrs=attrs,
+    )
+    monkeypatch.setattr(datasets, "DATA_PATH", tmp_path)
+    monkeypatch.setattr(datasets, "_fetch_air", lambda: data)
+    datasets.air_memory_mapped.cache_clear()
+    try:
+        air = datasets.air_memory_mapped()
+    finally:
+        datasets.air_memory_mapped.cache_clear()
+    assert air.attrs == {"actual_range": [185.16, 322.1], "precision": 2, "units": "degK"}
+
+
+def test_lttb():
+    x = np.arange(1000.0)
+    y = np.sin(x / 50)
+    y[500] = 10
+
+    xs, ys = holoviz.lttb(x, y, 100)
+    assert len(xs) == 100
+    assert xs[0] == 0 and xs[-1] == 999
+    assert ys.max() == 10
+    assert holoviz.lttb(x, y, 2000)[0] is x
+
+
+def test_cross_filter_index():
+    data = cross_filter.make_flowers(10_000)
+    index = cross_filter.Index(data, ["sepal_length", "sepal_width"], "petal_width")
+    ranges = [("sepal_length", 5, 6), ("sepal_width", 3, 3.5), ("petal_width", 0.1, 0.5)]
+
+    selected = np.ones(len(data), dtype=bool)
+    for column, low, high in ranges:
+        selected &= (data[column] >= low).values & (data[column] <= high).values
+    indices = index.select(ranges)
+    assert np.array_equal(np.sort(indices), np.flatnonzero(selected))
+    assert index.histogram(indices).sum() == selected.sum()
+    assert index.histogram().sum() == len(data)
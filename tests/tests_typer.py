@@ -0,0 +1,69 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+from presentation.shared.lifecycle import get_lifecycle
+from presentation.shared.typer import TypingScheduler
+
+_IDS = itertools.count()
+
+
+class _SessionContext:
+    """The part of the interface of Bokeh's `BokehSessionContext` used by the scheduler"""
+
+    def __init__(self, document):
+        self.id = f"session-{next(_IDS)}"
+        self.destroyed = False
+        self._document = document
+
+    async def with_locked_document(self, func):
+        await func(self._document)
+
+
+class _Document:
+    def __init__(self):
+        self.session_context = _SessionContext(self)
+        self.destroyed_callbacks = []
+
+    def on_session_destroyed(self, callback):
+        self.destroyed_callbacks.append(callback)
+
+    def destroy(self):
+        self.session_context.destroyed = True
+        for callback in self.destroyed_callbacks:
+            callback(self.session_context)
+
+
+def _get_model():
+    return SimpleNamespace(ref={"id": f"model-{next(_IDS)}"}, data=SimpleNamespace(position=0))
+
+
+def test_typers_share_one_scheduler():
+    async def run():
+        # The ticks are triggered by the test only
+        scheduler = TypingScheduler(period=10**6)
+        docs = [_Document() for _ in range(3)]
+        models = [_get_model() for _ in docs]
+        for doc, model in zip(docs, models):
+            scheduler.add(doc, model, "abcdefgh", "ab", chars_per_tick=4)
+        callback = scheduler._callback
+        assert callback is not None and len(scheduler.typings) == 3
+
+        await scheduler.tick()
+        assert [model.data.position for model in models] == [4, 4, 4]
+
+        docs[0].destroy()
+        await scheduler.tick()
+        assert [model.data.position for model in models] == [4, 8, 8]
+        assert scheduler._callback is callback
+
+        for _ in range(2):
+            await scheduler.tick()
+        assert [model.data.position for model in models] == [4, 10, 10]
+        assert not scheduler.typings and scheduler._callback is None
+        return docs
+
+    docs = asyncio.run(run())
+    report = {stats["id"]: stats for stats in get_lifecycle().report()["active"]}
+    assert docs[0].session_context.id not in report
+    assert report[docs[1].session_context.id]["calls"] == 4